@@ -1,5 +1,4 @@
 import math
-import random
 from typing import List
 
 from location import Location
@@ -106,8 +105,8 @@ class Batman(SpaceshipPilot):
 
 	def decide_corner(self, action):
 		pos = pilot.create_vec(
-			random.randint(0, self.gameSize),
-			random.randint(0, self.gameSize))
+			self.random.randint(0, self.gameSize),
+			self.random.randint(0, self.gameSize))
 
 		self.corner = pilot.create_vec(0, 0)
 		if pos[0] > self.gameSize/2:
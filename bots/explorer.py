@@ -1,5 +1,4 @@
 import math
-import random
 from typing import List
 
 from location import Location
@@ -21,7 +20,7 @@ class Explorer(SpaceshipPilot):
 		super().__init__("#FF4000")
 		self.gameWidth = 100
 		self.speed = 2
-		self.scanDir = random.random() * 2 * math.pi
+		self.scanDir = self.random.random() * 2 * math.pi
 		self.scanDist = self.gameWidth / 3
 		self.scanAngle = math.pi / 8
 		self.angleInc = 5 * math.pi / 8
@@ -88,5 +87,5 @@ class Explorer(SpaceshipPilot):
 
 	def create_rnd_point(self):
 		return pilot.create_vec(
-			random.random() * self.gameWidth,
-			random.random() * self.gameWidth)
+			self.random.random() * self.gameWidth,
+			self.random.random() * self.gameWidth)
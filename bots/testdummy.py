@@ -1,5 +1,4 @@
 import math
-import random
 from typing import List
 
 import numpy as np
@@ -13,7 +12,7 @@ class TestDummy(SpaceshipPilot):
 
 	def __init__(self):
 		super().__init__("#808080")
-		self.angle = random.random() * math.pi * 2
+		self.angle = self.random.random() * math.pi * 2
 		self.isStart = True
 
 	def prepare_scan(
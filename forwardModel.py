@@ -0,0 +1,138 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from location import Location
+
+# rules of GameHandler, in game units per game tick like the locations passed to pilots
+MAX_SPEED_PER_TICK = 5
+ROCKET_SPEED_PER_TICK = 5
+ROCKET_RADIUS = 1
+MOVE_COST_FACTOR = 5
+SHOOT_COST = 50
+ENERGY_PER_TICK = 10
+MAX_ENERGY = 100
+
+
+def apply_moves(velocities: np.ndarray, energies: np.ndarray, accelerations: np.ndarray):
+	"""
+	Accelerates spaceships like GameHandler: a move is only applied if the spaceship can afford it
+	and the speed of the spaceship is limited afterwards. All arrays are broadcast against each other.
+	:param velocities: (..., 2) array of velocities per tick
+	:param energies: (...) array of energies
+	:param accelerations: (..., 2) array of accelerations
+	:return: new velocities and energies
+	"""
+	power = np.minimum(MAX_SPEED_PER_TICK, np.linalg.norm(accelerations, axis=-1))
+	costs = power * MOVE_COST_FACTOR
+	is_affordable = costs <= energies
+
+	velocities = velocities + np.where(is_affordable[..., np.newaxis], accelerations, 0)
+	speeds = np.linalg.norm(velocities, axis=-1)
+	scales = MAX_SPEED_PER_TICK / np.where(speeds > MAX_SPEED_PER_TICK, speeds, MAX_SPEED_PER_TICK)
+	energies = np.where(is_affordable, np.maximum(0, energies - costs), energies)
+	return velocities * scales[..., np.newaxis], energies
+
+
+def apply_shots(energies: np.ndarray, shoot_angles: np.ndarray):
+	"""
+	Shoots rockets like GameHandler: a rocket is only shot if the spaceship has enough energy for it.
+	:param energies: (...) array of energies
+	:param shoot_angles: (...) array of shoot angles, NaN for not shooting
+	:return: new energies, which rockets were shot and the velocity of each rocket per tick
+	"""
+	is_shot = ~np.isnan(shoot_angles) & (energies >= SHOOT_COST)
+	angles = np.where(is_shot, shoot_angles, 0)
+	rocket_velocities = np.stack([np.cos(angles), np.sin(angles)], axis=-1) * ROCKET_SPEED_PER_TICK
+	rocket_velocities[~is_shot] = 0
+	return np.where(is_shot, energies - SHOOT_COST, energies), is_shot, rocket_velocities
+
+
+class Rollout:
+
+	def __init__(self, candidate_count: int, tick_count: int):
+		"""
+		Predicted states of one spaceship for several candidate action sequences.
+		Index 0 of the tick axis is the current state, index k the state k ticks later.
+		"""
+		self.positions = np.zeros((candidate_count, tick_count + 1, 2))
+		self.velocities = np.zeros((candidate_count, tick_count + 1, 2))
+		self.energies = np.zeros((candidate_count, tick_count + 1))
+		# rocket shot in tick k starts at positions[:, k]
+		self.rocketVelocities = np.zeros((candidate_count, tick_count, 2))
+		self.isRocketShot = np.zeros((candidate_count, tick_count), dtype=bool)
+
+	def get_rocket_positions(self, tick: int) -> np.ndarray:
+		"""
+		Returns the positions of the rockets shot before the given tick at that tick.
+		Rockets that were not shot (yet) are at the position of the spaceship when they would have been shot.
+		:return: (candidates, ticks, 2) array
+		"""
+		tick_count = self.rocketVelocities.shape[1]
+		flight_ticks = np.maximum(0, tick - np.arange(tick_count))
+		return self.positions[:, :-1] + self.rocketVelocities * flight_ticks[np.newaxis, :, np.newaxis]
+
+
+def rollout(
+		location: Location,
+		energy: float,
+		accelerations: np.ndarray,
+		shoot_angles: Optional[np.ndarray] = None) -> Rollout:
+	"""
+	Predicts the own spaceship for many candidate action sequences at once. Collisions are not simulated.
+	:param location: current location of the spaceship as passed to update()
+	:param energy: current energy of the spaceship as passed to update()
+	:param accelerations: (candidates, ticks, 2) array with the acceleration of each tick
+	:param shoot_angles: optional (candidates, ticks) array with the shoot angle of each tick, NaN for not shooting
+	"""
+	candidate_count, tick_count = accelerations.shape[0:2]
+	if shoot_angles is None:
+		shoot_angles = np.full((candidate_count, tick_count), np.nan)
+
+	result = Rollout(candidate_count, tick_count)
+	result.positions[:, 0] = location.get_position()
+	result.velocities[:, 0] = location.get_velocity()
+	result.energies[:, 0] = energy
+
+	for tick in range(tick_count):
+		velocities, energies = apply_moves(result.velocities[:, tick], result.energies[:, tick], accelerations[:, tick])
+		energies, result.isRocketShot[:, tick], result.rocketVelocities[:, tick] = apply_shots(energies, shoot_angles[:, tick])
+		result.positions[:, tick + 1] = result.positions[:, tick] + velocities
+		result.velocities[:, tick + 1] = velocities
+		result.energies[:, tick + 1] = np.minimum(MAX_ENERGY, energies + ENERGY_PER_TICK)
+	return result
+
+
+def predict_positions(locations: np.ndarray, ticks: np.ndarray) -> np.ndarray:
+	"""
+	Predicts positions of spaceships that keep their velocity, e.g. located spaceships.
+	:param locations: (n, 2, 2) array of positions and velocities
+	:param ticks: (t) array of ticks to predict
+	:return: (n, t, 2) array of positions
+	"""
+	return locations[:, np.newaxis, 0] + locations[:, np.newaxis, 1] * np.asarray(ticks)[np.newaxis, :, np.newaxis]
+
+
+def calc_closest_approaches(
+		starts: np.ndarray,
+		velocities: np.ndarray,
+		target_positions: np.ndarray,
+		target_velocities: np.ndarray,
+		max_ticks: float = math.inf):
+	"""
+	Calculates how close rockets get to spaceships that keep their velocity. All arrays are broadcast against each other.
+	:param starts: (..., 2) array of rocket start positions
+	:param velocities: (..., 2) array of rocket velocities per tick
+	:param target_positions: (..., 2) array of current spaceship positions
+	:param target_velocities: (..., 2) array of spaceship velocities per tick
+	:param max_ticks: only considers the given number of ticks
+	:return: closest distances and the tick when they are reached
+	"""
+	offsets = starts - target_positions
+	relative_velocities = velocities - target_velocities
+	speeds_sq = np.sum(relative_velocities * relative_velocities, axis=-1)
+	ticks = -np.sum(offsets * relative_velocities, axis=-1) / np.where(speeds_sq > 0, speeds_sq, 1)
+	ticks = np.clip(ticks, 0, max_ticks)
+	closest = offsets + relative_velocities * ticks[..., np.newaxis]
+	return np.linalg.norm(closest, axis=-1), ticks
@@ -1,6 +1,11 @@
+from typing import TYPE_CHECKING
+
 from Box2D import b2World, b2Color
 
-from render.pygletDraw import PygletDraw
+from game.collisionFilter import BORDER_CATEGORY, BORDER_MASK
+
+if TYPE_CHECKING:
+	from render.pygletDraw import PygletDraw
 
 
 class BoxBorder:
@@ -18,6 +23,9 @@ class BoxBorder:
 			 (size, 0),
 			 (0, 0)]
 		)
+		for fixture in self.body.fixtures:
+			fixture.filterData.categoryBits = BORDER_CATEGORY
+			fixture.filterData.maskBits = BORDER_MASK
 		self.displayVertices = [
 			(0, 0),
 			(0 - thickness, 0 - thickness),
@@ -31,5 +39,5 @@ class BoxBorder:
 			(0 - thickness, 0 - thickness),
 		]
 
-	def display(self, renderer: PygletDraw, layer_index: int):
+	def display(self, renderer: "PygletDraw", layer_index: int):
 		renderer.DrawSolidTriangleStrip(layer_index, self.displayVertices, self.fill)
@@ -1,4 +1,9 @@
-from Box2D import b2ContactListener, b2World, b2Color
+import heapq
+import itertools
+from typing import Optional, Tuple
+
+import numpy as np
+from Box2D import b2ContactListener, b2World, b2Color, b2Vec2
 
 from game.boxExplosion import BoxExplosion
 from game.boxRocket import BoxRocket
@@ -8,80 +13,178 @@ from game.boxSpaceship import BoxSpaceship
 
 class BoxContactListener(b2ContactListener):
 
-	def __init__(self, world: b2World):
+	def __init__(self, world: b2World, steps_per_second: float = 60):
 		b2ContactListener.__init__(self)
 		self._world = world
-		self.spaceships = set()
+		self.stepsPerSecond = steps_per_second
+		# number of finished physics steps, used as clock for scans and explosions
+		self.stepCount = 0
+		# dict as insertion ordered set, so that spaceships are updated in the same order every match
+		self.spaceships = {}
 		self.rockets = set()
 		self.explosions = set()
 		self.scans = set()
 		self._bodies_to_remove = set()
+		# rocket contacts of the current physics step as (rocket id, other id), applied after world.Step
+		self._contacts = np.zeros((64, 2), dtype=np.int64)
+		self._contactCount = 0
+		# rockets and spaceships by their contact id, the border has no id
+		self._contactObjects = {}
+		self._contactIds = itertools.count()
+		# number of BeginContact calls from Box2D since the last reset
+		self.contactCallbackCount = 0
+		# min-heap of (end step, insertion number, effect) for pruning only the expired effects
+		self._effect_ends = []
+		self._effect_counter = itertools.count()
+		# number of bodies in the world at the start of the last match, for detecting leaked bodies
+		self._matchStartBodyCount: Optional[int] = None
 
 	def reset(self):
+		"""
+		Removes all spaceships, rockets and effects of the current match from the world.
+		"""
 		self._bodies_to_remove.update([ship.body for ship in self.spaceships])
+		self._bodies_to_remove.update([rocket.body for rocket in self.rockets])
 		self.spaceships.clear()
 		self.rockets.clear()
 		self.explosions.clear()
 		self.scans.clear()
+		self._effect_ends.clear()
+		self._contactCount = 0
+		self._contactObjects.clear()
+		self.contactCallbackCount = 0
+		self.stepCount = 0
 		self.remove_bodies()
 
+	def get_world_counts(self) -> Tuple[int, int]:
+		"""
+		:return: number of bodies and contacts in the world
+		"""
+		return self._world.bodyCount, self._world.contactCount
+
+	def start_match(self) -> Tuple[int, int]:
+		"""
+		Checks the world for bodies left over from the last match. Call this before spawning spaceships.
+		:return: number of bodies and contacts in the world
+		"""
+		counts = self.get_world_counts()
+		if self._matchStartBodyCount is not None and counts[0] > self._matchStartBodyCount:
+			print(
+				"Warning: world has " + str(counts[0]) + " bodies at the start of the match, "
+				+ str(counts[0] - self._matchStartBodyCount) + " more than at the start of the last match.")
+		self._matchStartBodyCount = counts[0]
+		return counts
+
+	def seconds_to_steps(self, seconds: float) -> int:
+		return int(round(seconds * self.stepsPerSecond))
+
+	def launch_rocket(self, shooter: BoxSpaceship, velocity: b2Vec2, pos: b2Vec2 = None):
+		"""
+		:param pos: start position of the rocket, the position of the shooter if None
+		"""
+		self.add_rocket(BoxRocket(self._world, shooter, velocity, pos=pos))
+
 	def add_rocket(self, rocket: BoxRocket):
 		self.rockets.add(rocket)
+		self._add_contact_object(rocket)
 
 	def add_spaceship(self, spaceship: BoxSpaceship):
-		self.spaceships.add(spaceship)
+		self.spaceships[spaceship] = None
+		self._add_contact_object(spaceship)
+
+	def _add_contact_object(self, contact_object):
+		contact_object.contactId = next(self._contactIds)
+		self._contactObjects[contact_object.contactId] = contact_object
 
 	def add_scan(self, scan: BoxScan):
 		self.scans.add(scan)
+		self._add_effect(scan)
 
-	def BeginContact(self, contact):
-		body_a = contact.fixtureA.body
-		body_b = contact.fixtureB.body
+	def add_explosion(self, explosion: BoxExplosion):
+		self.explosions.add(explosion)
+		self._add_effect(explosion)
 
-		if isinstance(body_a.userData, BoxRocket):
-			self._handle_rocket_impact(body_a.userData, body_b.userData)
-		if isinstance(body_b.userData, BoxRocket):
-			self._handle_rocket_impact(body_b.userData, body_a.userData)
+	def _add_effect(self, effect):
+		heapq.heappush(self._effect_ends, (effect.end, next(self._effect_counter), effect))
 
-	def _handle_rocket_impact(self, rocket: BoxRocket, other):
-		# prevents rockets from destroying other rockets of same spaceship
-		if isinstance(other, BoxRocket) and other.shooter == rocket.shooter:
+	def BeginContact(self, contact):
+		"""
+		Only records rocket contacts, they are applied by handle_contacts() after world.Step.
+		"""
+		self.contactCallbackCount += 1
+		object_a = contact.fixtureA.body.userData
+		object_b = contact.fixtureB.body.userData
+
+		if isinstance(object_a, BoxRocket):
+			self._queue_contact(object_a, object_b)
+		if isinstance(object_b, BoxRocket):
+			self._queue_contact(object_b, object_a)
+
+	def _queue_contact(self, rocket: BoxRocket, other):
+		if self._contactCount == len(self._contacts):
+			self._contacts = np.concatenate([self._contacts, np.zeros_like(self._contacts)])
+		self._contacts[self._contactCount] = (rocket.contactId, other.contactId if other is not None else -1)
+		self._contactCount += 1
+
+	def handle_contacts(self):
+		"""
+		Applies the rocket contacts of the last physics step sorted by rocket and contact id,
+		so that simultaneous hits are resolved in the same order every time.
+		"""
+		if self._contactCount == 0:
 			return
-		if isinstance(other, BoxSpaceship):
-			# prevents rockets from damaging own spaceship
-			if rocket.shooter != other:
+		contacts = self._contacts[:self._contactCount]
+		contacts = contacts[np.lexsort((contacts[:, 1], contacts[:, 0]))]
+		self._contactCount = 0
+
+		hit_rockets = {}
+		for rocket_id, other_id in contacts.tolist():
+			rocket = self._contactObjects[rocket_id]
+			other = self._contactObjects.get(other_id)
+			# contacts with the shooter and its other rockets are already filtered out by Box2D (see collisionFilter)
+			if isinstance(other, BoxSpaceship):
 				self.damage_spaceship(other, 20)
-			else:
-				return
-		self._bodies_to_remove.add(rocket.body)
-		self.rockets.discard(rocket)
-		self.explosions.add(BoxExplosion(rocket.body.position, 3, 1, rocket.color))
+			self.add_explosion(BoxExplosion(rocket.body.position, 3, self.stepCount, self.seconds_to_steps(1), rocket.color))
+			hit_rockets[rocket] = None
+
+		for rocket in hit_rockets:
+			self.rockets.discard(rocket)
+			del self._contactObjects[rocket.contactId]
+			self._world.DestroyBody(rocket.body)
 
 	def damage_spaceship(self, spaceship, damage: float):
 		spaceship.damage(damage)
 		if spaceship.health <= 0:
-			self._bodies_to_remove.add(spaceship.body)
-			self.spaceships.discard(spaceship)
-			self.explosions.add(BoxExplosion(spaceship.body.position, 5, 2, b2Color(1, 0, 0)))
-
-	def remove_bodies(self):
-		for scan in list(self.scans):
-			if scan.is_over():
-				self.scans.discard(scan)
+			self.destroy_spaceship(spaceship)
+
+	def destroy_spaceship(self, spaceship: BoxSpaceship):
+		self._bodies_to_remove.add(spaceship.body)
+		self.spaceships.pop(spaceship, None)
+		# later rockets of the same step only explode without hitting the destroyed spaceship again
+		self._contactObjects.pop(spaceship.contactId, None)
+		self.add_explosion(BoxExplosion(spaceship.body.position, 5, self.stepCount, self.seconds_to_steps(2), b2Color(1, 0, 0)))
+
+	def after_world_step(self):
+		"""
+		Applies the contacts recorded during the world step.
+		"""
+		self.handle_contacts()
+
+	def end_step(self):
+		"""
+		Finishes a physics step: advances the effect clock, removes expired effects and destroys dead bodies.
+		"""
+		self.stepCount += 1
+		self.remove_expired_effects()
+		self.remove_bodies()
 
-		for explosion in list(self.explosions):
-			if explosion.is_over():
-				self.explosions.discard(explosion)
+	def remove_expired_effects(self):
+		while self._effect_ends and self._effect_ends[0][0] <= self.stepCount:
+			effect = heapq.heappop(self._effect_ends)[2]
+			self.scans.discard(effect)
+			self.explosions.discard(effect)
 
+	def remove_bodies(self):
 		for body in self._bodies_to_remove:
 			self._world.DestroyBody(body)
 		self._bodies_to_remove.clear()
-
-	def EndContact(self, contact):
-		pass
-
-	def PreSolve(self, contact, oldManifold):
-		pass
-
-	def PostSolve(self, contact, impulse):
-		pass
@@ -1,33 +1,36 @@
-import datetime
 import math
+from typing import TYPE_CHECKING
 
 from Box2D import b2Color, b2Vec2
 
-from render.pygletDraw import PygletDraw
+if TYPE_CHECKING:
+	from render.pygletDraw import PygletDraw
 
 
 class BoxExplosion:
 
-	def __init__(self, pos: b2Vec2, radius: float, duration: float = 1, color: b2Color = b2Color(1, 1, 1)):
+	def __init__(self, pos: b2Vec2, radius: float, start_step: int = 0, duration: int = 60, color: b2Color = b2Color(1, 1, 1)):
+		"""
+		Visual of an explosion that expands and fades out over a number of physics steps.
+		:param start_step: simulation step the explosion was created at
+		:param duration: number of simulation steps the explosion is visible
+		"""
 		self.pos = b2Vec2(pos)
 		self.radius = radius
-		self.duration = datetime.timedelta(seconds=duration)
 		self.color = b2Color(color)
-		self.start = datetime.datetime.now()
-		pass
+		self.start = start_step
+		self.duration = max(1, duration)
+		self.end = self.start + self.duration
 
-	def is_over(self):
-		dt = datetime.datetime.now() - self.start
-		return dt > self.duration
+	def is_over(self, step_count: int):
+		return step_count >= self.end
 
-	def display(self, renderer: PygletDraw, layer_index: int):
-		dt = datetime.datetime.now() - self.start
-		if dt > self.duration:
+	def display(self, renderer: "PygletDraw", layer_index: int, step_count: int):
+		if self.is_over(step_count):
 			return
-		scale = 1 - math.pow(1 - (dt / self.duration), 3)
+		scale = 1 - math.pow(1 - ((step_count - self.start) / self.duration), 3)
 		color_mid = b2Color(self.color)
 		color_out = b2Color(self.color)
 		color_mid.a = 0.2 * (1 - scale)
 		color_out.a = (1 - scale)
 		renderer.DrawGradientCirc(layer_index, self.pos, self.radius * scale, color_mid, color_out)
-
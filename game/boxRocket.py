@@ -1,9 +1,13 @@
 import math
+from typing import TYPE_CHECKING
 
 from Box2D import b2World, b2FixtureDef, b2CircleShape, b2Vec2, b2Color
 
 from game.boxSpaceship import BoxSpaceship
-from render.pygletDraw import PygletDraw
+from game.collisionFilter import ROCKET_CATEGORY, ROCKET_MASK, calc_group_index
+
+if TYPE_CHECKING:
+	from render.pygletDraw import PygletDraw
 
 
 class BoxRocket:
@@ -12,11 +16,17 @@ class BoxRocket:
 	             world: b2World,
 	             shooter: BoxSpaceship,
 	             heading: b2Vec2,
-	             radius: float = 1.0):
+	             radius: float = 1.0,
+	             pos: b2Vec2 = None):
+		"""
+		:param pos: start position of the rocket, the position of the shooter if None
+		"""
 		self.world = world
 		self.shooter = shooter
 		self.radius = radius
 		self.color = b2Color(shooter.color)
+		# assigned by BoxContactListener
+		self.contactId = None
 
 		self.shadowVerts = []
 		self.shadowColor = b2Color(self.color)
@@ -28,12 +38,16 @@ class BoxRocket:
 		self.body = self.world.CreateDynamicBody(
 			userData=self,  # adds a reference on the body to the rocket object
 			allowSleep=True,
-			position=shooter.get_location(0).get_position(),
+			position=shooter.body.position if pos is None else pos,
 			angle=math.atan2(heading.y, heading.x),
 			linearVelocity=heading,
 			fixtures=b2FixtureDef(
 				shape=b2CircleShape(radius=radius),
 				isSensor=True,
+				categoryBits=ROCKET_CATEGORY,
+				maskBits=ROCKET_MASK,
+				# rockets never touch their shooter or other rockets of the same shooter
+				groupIndex=calc_group_index(shooter.index),
 			)
 		)
 
@@ -45,7 +59,7 @@ class BoxRocket:
 			b2Vec2(-length, -self.radius)
 		]
 
-	def display(self, renderer: PygletDraw, layer_index: int):
+	def display(self, renderer: "PygletDraw", layer_index: int):
 		# makes shadow look funny when grabbing and redirecting a rocket xD
 		self.body.angle = math.atan2(self.body.linearVelocity.y, self.body.linearVelocity.x)
 
@@ -1,9 +1,10 @@
-import datetime
 import math
+from typing import TYPE_CHECKING
 
 from Box2D import b2Color, b2Vec2
 
-from render.pygletDraw import PygletDraw
+if TYPE_CHECKING:
+	from render.pygletDraw import PygletDraw
 
 
 class BoxScan:
@@ -14,25 +15,29 @@ class BoxScan:
 	             distance: float,
 	             angle: float,
 	             color: b2Color = b2Color(0.8, 0.8, 1),
-	             duration: float = 0.2):
+	             start_step: int = 0,
+	             duration: int = 12):
+		"""
+		Visual of a scan that fades out over a number of physics steps.
+		:param start_step: simulation step the scan was created at
+		:param duration: number of simulation steps the scan is visible
+		"""
 		self.pos = b2Vec2(pos)
 		self.distance = distance
 		self.angleStart = direction - angle / 2
 		self.angleEnd = direction + angle / 2
-		self.duration = datetime.timedelta(seconds=duration)
 		self.color = b2Color(color)
-		self.start = datetime.datetime.now()
-		pass
+		self.start = start_step
+		self.duration = max(1, duration)
+		self.end = self.start + self.duration
 
-	def is_over(self):
-		dt = datetime.datetime.now() - self.start
-		return dt > self.duration
+	def is_over(self, step_count: int):
+		return step_count >= self.end
 
-	def display(self, renderer: PygletDraw, layer_index: int):
-		dt = datetime.datetime.now() - self.start
-		if dt > self.duration:
+	def display(self, renderer: "PygletDraw", layer_index: int, step_count: int):
+		if self.is_over(step_count):
 			return
-		fade = 1 - math.pow(dt / self.duration, 3)
+		fade = 1 - math.pow((step_count - self.start) / self.duration, 3)
 		color_mid = b2Color(self.color)
 		color_mid.a = 0.05 * fade
 		color_out = b2Color(self.color)
@@ -1,14 +1,17 @@
 import math
-from typing import List
+from typing import List, TYPE_CHECKING
 
-import numpy as np
 from Box2D import (b2World, b2PolygonShape, b2FixtureDef, b2Color, b2Vec2)
 
-from render.pygletDraw import PygletDraw
+from game.collisionFilter import SPACESHIP_CATEGORY, SPACESHIP_MASK, calc_group_index
+from game.shipStates import ShipStates
 from location import Location
 from pilotAction import PilotAction, ScanAction
 from spaceshipPilot import SpaceshipPilot
 
+if TYPE_CHECKING:
+	from render.pygletDraw import PygletDraw
+
 hitbox = [
 	(-1.37, -0.58),
 	(-1.89, -0.43),
@@ -64,15 +67,23 @@ viewbox = [b2Vec2(v[0], v[1]) for v in viewbox]
 
 class BoxSpaceship:
 
-	def __init__(self, world: b2World, pilot: SpaceshipPilot, max_health: int, max_energy: float, color: b2Color = b2Color(1., 1., 1.), pos: b2Vec2 = b2Vec2(0, 0), angle: float = 0):
+	def __init__(self, world: b2World, pilot: SpaceshipPilot, max_health: int, max_energy: float, color: b2Color = b2Color(1., 1., 1.), pos: b2Vec2 = b2Vec2(0, 0), angle: float = 0, states: ShipStates = None):
+		"""
+		:param states: store of the match that keeps health and energy of this spaceship
+		"""
 		self.pilot = pilot
-		self.name = type(pilot).__name__
+		# sandboxed pilots are named after the pilot class they host
+		self.name = pilot.pilotName if hasattr(pilot, "pilotName") else type(pilot).__name__
 		self.displayName = self.name[0:16] if len(self.name) > 16 else self.name
 
 		self.max_health = max_health
-		self.health = max_health
 		self.max_energy = max_energy
-		self.energy = max_energy
+		self.states = states if states is not None else ShipStates(1)
+		self.index = self.states.add(self, max_health, max_energy)
+		# assigned by BoxContactListener
+		self.contactId = None
+		# number of times the pilot raised an exception
+		self.crashCount = 0
 
 		self.color = b2Color(color)
 		self.shape = b2PolygonShape(vertices=hitbox)
@@ -84,21 +95,37 @@ class BoxSpaceship:
 			shapes=[self.shape],
 			shapeFixture=b2FixtureDef(
 				restitution=0.2,  # bounciness between 0 and 1
+				categoryBits=SPACESHIP_CATEGORY,
+				maskBits=SPACESHIP_MASK,
+				groupIndex=calc_group_index(self.index),
 			),
 			fixedRotation=True  # fixes angular velocity to one value
 		)
 
-	def add_energy(self, energy_amount: int):
-		self.energy = min(self.max_energy, self.energy + energy_amount)
+	@property
+	def health(self) -> float:
+		return self.states.health[self.index]
+
+	@health.setter
+	def health(self, health: float):
+		self.states.health[self.index] = health
+
+	@property
+	def energy(self) -> float:
+		return self.states.energy[self.index]
+
+	@energy.setter
+	def energy(self, energy: float):
+		self.states.energy[self.index] = energy
 
 	def use_energy(self, energy_amount: float):
 		self.energy = max(0, self.energy - energy_amount)
 
-	def prepare_scan(self, game_tick: int, ticks_per_second: int) -> ScanAction:
-		return self.pilot.prepare_scan(game_tick, self.get_location(ticks_per_second), self.health, self.energy)
+	def prepare_scan(self, game_tick: int, location: Location) -> ScanAction:
+		return self.pilot.prepare_scan(game_tick, location, self.health, self.energy)
 
-	def update(self, game_tick: int, ticks_per_second: int, located_rockets: List[np.ndarray]) -> PilotAction:
-		return self.pilot.update(game_tick, self.get_location(ticks_per_second), self.health, self.energy, located_rockets)
+	def update(self, game_tick: int, location: Location, located_spaceships: List[Location]) -> PilotAction:
+		return self.pilot.update(game_tick, location, self.health, self.energy, located_spaceships)
 
 	def move(self, acceleration: b2Vec2, max_velocity_per_tick, ticks_per_second):
 		self.body.linearVelocity += acceleration * ticks_per_second
@@ -114,12 +141,7 @@ class BoxSpaceship:
 	def damage(self, amount: int):
 		self.health = max(0, self.health - amount)
 
-	def get_location(self, ticks_per_second:int = 1):
-		pos = self.body.position
-		vel = self.body.linearVelocity / ticks_per_second
-		return Location(np.array([pos.x, pos.y]), np.array([vel.x, vel.y]))
-
-	def display(self, renderer: PygletDraw, layer_index: int, text_layer_index: int):
+	def display(self, renderer: "PygletDraw", layer_index: int, text_layer_index: int):
 		vertices = []
 
 		for v in viewbox:
@@ -132,7 +154,7 @@ class BoxSpaceship:
 		self.display_bar(renderer, layer_index, self.health/self.max_health, 5.0, b2Color(0.9, 0.0, 0.0))
 		self.display_bar(renderer, layer_index, self.energy/self.max_energy, 4.0, b2Color(0.1, 0.25, 1.0))
 
-	def display_bar(self, renderer: PygletDraw, layer_index: int, percent: float, offset: float, color: b2Color = b2Color(1.0, 1.0, 1.0), width: float = 10, height: float = 0.6):
+	def display_bar(self, renderer: "PygletDraw", layer_index: int, percent: float, offset: float, color: b2Color = b2Color(1.0, 1.0, 1.0), width: float = 10, height: float = 0.6):
 		color_missing = b2Color(color)
 		color_missing.a = 0.5
 
@@ -0,0 +1,20 @@
+"""
+Box2D collision filter bits. Contacts that the game would ignore anyway are dropped by Box2D,
+so they never reach BoxContactListener.
+"""
+
+BORDER_CATEGORY = 0x0001
+SPACESHIP_CATEGORY = 0x0002
+ROCKET_CATEGORY = 0x0004
+
+BORDER_MASK = SPACESHIP_CATEGORY | ROCKET_CATEGORY
+SPACESHIP_MASK = BORDER_CATEGORY | SPACESHIP_CATEGORY | ROCKET_CATEGORY
+ROCKET_MASK = BORDER_CATEGORY | SPACESHIP_CATEGORY | ROCKET_CATEGORY
+
+
+def calc_group_index(spaceship_index: int) -> int:
+	"""
+	Returns the negative Box2D group index shared by a spaceship and its rockets, so that they never collide.
+	Box2D stores group indices as 16 bit integers, so they repeat after 32767 spaceships.
+	"""
+	return -(spaceship_index % 32767 + 1)
@@ -1,23 +1,77 @@
+import asyncio
+import hashlib
 import math
 import random
+import struct
 import traceback
+from concurrent.futures import Future
+from typing import Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from Box2D import b2Vec2, b2World, b2Color
 
 from game.boxContactListener import BoxContactListener
-from game.boxRocket import BoxRocket
 from game.boxScan import BoxScan
 from game.boxSpaceship import BoxSpaceship
-from logic import scanning
+from game.hostedPilot import HostCalls, HostedPilot
+from game.pilotSandbox import PilotCalls, PilotSandbox, SandboxedPilot
+from game.shipStates import ShipStates
+from location import Location
+from logic import poissonDisk, scanning
+from logic.spatialGrid import SpatialGrid
 from pilotAction import PilotAction, ScanAction
-from spaceshipPilot import SpaceshipPilot
+from spaceshipPilot import AsyncSpaceshipPilot, SpaceshipPilot
 from util import colorParse
 
 
+async def run_with_deadline(coroutines: List[Coroutine], deadline: float) -> Tuple[List[asyncio.Task], Set[asyncio.Task]]:
+	"""
+	Runs the coroutines at once and cancels those that did not finish after deadline seconds.
+	Cancelled coroutines are not waited for, they end the next time the event loop runs.
+	:return: one task per coroutine and the cancelled tasks
+	"""
+	tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+	_, late = await asyncio.wait(tasks, timeout=deadline)
+	for task in late:
+		task.cancel()
+	return tasks, late
+
+
+class PilotTick:
+
+	def __init__(self, spaceships: List[BoxSpaceship], external: Set[BoxSpaceship], locations: List[Location]):
+		"""
+		Pilots of a game tick, from starting prepare_scan to applying the actions.
+		:param spaceships: spaceships alive at the start of the tick
+		:param external: spaceships controlled without their pilots
+		:param locations: location of each spaceship at the start of the tick
+		"""
+		self.spaceships = spaceships
+		self.external = external
+		self.locations = locations
+		self.scanResults: Dict[BoxSpaceship, List[Location]] = {}
+		self.isScanning = True
+		# running calls of sandboxed and hosted pilots, each with the indices of their spaceships
+		self.calls: List[Tuple[List[int], Union[PilotCalls, HostCalls]]] = []
+
+	def are_calls_done(self) -> bool:
+		return all(calls.is_done() for _, calls in self.calls)
+
+	def collect_calls(self) -> Dict[int, Future]:
+		"""
+		Waits for the running calls.
+		:return: the calls by index of their spaceship
+		"""
+		calls = {}
+		for indices, running_calls in self.calls:
+			calls.update(zip(indices, running_calls.collect()))
+		self.calls = []
+		return calls
+
+
 class GameHandler:
 
-	def __init__(self, world: b2World, contact_handler: BoxContactListener, game_size: int, ticks_per_second: int):
+	def __init__(self, world: b2World, contact_handler: BoxContactListener, game_size: int, ticks_per_second: int, seed: Optional[int] = None):
 		self.world = world
 		self.contactHandler = contact_handler
 		self.gameSize = game_size
@@ -42,121 +96,485 @@ class GameHandler:
 		self.moveCostFactor = 5
 		self.scanCostFactor = 1.0 / (10 * math.pi)
 
-	def reset(self):
+		# from this number of spaceships on, scans only test spaceships in grid cells near the scan
+		self.scanGridMinSpaceships = 64
+		self.scanGrid = SpatialGrid(self.gameSize, 10)
+
+		# from this number of spaceships on, spaceships are spawned apart from each other all over the field
+		self.spacedSpawnMinSpaceships = 9
+		# minimum distance between spaceships spawned apart from each other
+		self.spawnSpacing = 8
+
+		# health, energy, positions and velocities of all spaceships as arrays
+		self.shipStates = ShipStates()
+
+		# match random generator for spawns, scan result order and pilot seeds
+		self.random = random.Random()
+		self.seed = None
+		# if enabled, a digest of all bodies is recorded after each game tick
+		self.recordDigests = False
+		self.digests = []
+		# spaceships that are controlled with action arrays instead of their pilots, see TrainingEnv
+		self.externalSpaceships: List[BoxSpaceship] = []
+		self.externalAccelerations = np.zeros((0, 2))
+		# NaN for not shooting
+		self.externalShootAngles = np.zeros(0)
+		# hosts each pilot in its own process if set
+		self.pilotSandbox: Optional[PilotSandbox] = None
+		# if enabled, sandboxed pilots think during the physics steps until the next game tick,
+		# and their actions are applied one game tick later
+		self.pipelinePilots = False
+		self.pendingTick: Optional[PilotTick] = None
+		# seconds the coroutines of async pilots may take in each half of a game tick
+		self.asyncPilotDeadline = 0.05
+		# event loop of all async pilots, kept between game ticks so that pilots can keep connections open
+		self.asyncLoop: Optional[asyncio.AbstractEventLoop] = None
+		self.reset(seed)
+
+	def reset(self, seed: Optional[int] = None):
+		"""
+		Prepares a new match. Matches with the same seed and pilots play out the same way.
+		:param seed: seed for the match, a random one is chosen if None
+		"""
 		self.gameTick = 0
+		self.shipStates.clear()
+		self.externalSpaceships = []
+		self.seed = seed if seed is not None else random.getrandbits(32)
+		self.random.seed(self.seed)
+		self.digests = []
+		self.pendingTick = None
+		self.close_async_loop()
+
+	def close_async_loop(self):
+		"""
+		Closes the event loop of async pilots, e.g. at the end of a match. A new one is created when needed.
+		"""
+		if self.asyncLoop:
+			# lets cancelled coroutines of late pilots end
+			self.asyncLoop.run_until_complete(asyncio.sleep(0))
+			self.asyncLoop.close()
+			self.asyncLoop = None
+
+	def create_pilot(self, pilot_class) -> SpaceshipPilot:
+		"""
+		Creates a pilot whose random generator is seeded from the match seed.
+		"""
+		seed = self.random.getrandbits(64)
+		if self.pilotSandbox:
+			return self.pilotSandbox.create_pilot(pilot_class, seed)
+		return pilot_class.create_seeded(seed)
+
+	def spawn_pilots(self, pilot_classes: List) -> List[BoxSpaceship]:
+		"""
+		Creates a pilot and a spaceship for each pilot class. Pilots that can't be created or spawned are left out.
+		Many spaceships are placed with Poisson-disk sampling, so that they don't overlap.
+		:raise ValueError: if the game field is too small for that many spaceships
+		"""
+		if len(pilot_classes) < self.spacedSpawnMinSpaceships:
+			spaceships = [self._try_spawn_pilot(pilot_class) for pilot_class in pilot_classes]
+			return [spaceship for spaceship in spaceships if spaceship]
+		return self.spawn_spaced_pilots(pilot_classes)
+
+	def spawn_spaced_pilots(self, pilot_classes: List) -> List[BoxSpaceship]:
+		"""
+		Creates a pilot for each pilot class and spawns their spaceships with Poisson-disk sampling so that they don't overlap.
+		:raise ValueError: if the game field is too small for that many spaceships
+		"""
+		pilots = []
+		for pilot_class in pilot_classes:
+			try:
+				pilots.append((pilot_class, self.create_pilot(pilot_class)))
+			except Exception:
+				print_spawn_error(pilot_class)
+		points = poissonDisk.sample_poisson_disk(self.spawnSpacing, self.gameSize - self.spawnSpacing, self.spawnSpacing, len(pilots), self.random)
+		if len(points) < len(pilots):
+			raise ValueError(
+				"Could not spawn " + str(len(pilots)) + " spaceships apart from each other, the game field of size "
+				+ str(self.gameSize) + " only fits " + str(len(points)) + ".")
+		spaceships = [self._try_spawn_pilot(pilot_class, pilot, b2Vec2(point)) for (pilot_class, pilot), point in zip(pilots, points)]
+		return [spaceship for spaceship in spaceships if spaceship]
+
+	def _try_spawn_pilot(self, pilot_class, pilot: Optional[SpaceshipPilot] = None, pos: b2Vec2 = None) -> Optional[BoxSpaceship]:
+		"""
+		Creates the pilot if it is not given and spawns its spaceship.
+		:return: the spaceship or None if the pilot raised an exception, which is printed
+		"""
+		try:
+			if pilot is None:
+				pilot = self.create_pilot(pilot_class)
+			return self.spawn_spaceship(pilot, pos)
+		except Exception:
+			print_spawn_error(pilot_class)
+			return None
 
-	def spawn_spaceship(self, pilot: SpaceshipPilot):
-		angle = random.uniform(-math.pi, math.pi)
-		distance = self.spaceshipSpawnRange * math.acos(random.uniform(0, 1)) / math.pi
-		pos = b2Vec2(
-			self.gameSize / 2 + math.cos(angle) * distance,
-			self.gameSize / 2 + math.sin(angle) * distance)
+	def spawn_spaceship(self, pilot: SpaceshipPilot, pos: b2Vec2 = None, angle: float = None) -> BoxSpaceship:
+		"""
+		:param pos: spawn position, a random one around the center is chosen if None
+		:param angle: rotation of the spaceship, a random one is chosen if None
+		"""
+		if pos is None:
+			spawn_angle = self.random.uniform(-math.pi, math.pi)
+			distance = self.spaceshipSpawnRange * math.acos(self.random.uniform(0, 1)) / math.pi
+			pos = b2Vec2(
+				self.gameSize / 2 + math.cos(spawn_angle) * distance,
+				self.gameSize / 2 + math.sin(spawn_angle) * distance)
+		if angle is None:
+			angle = self.random.uniform(-math.pi, math.pi)
 
 		ship_color = b2Color(1, 1, 1)
 		if hasattr(pilot, "shipColor"):
 			ship_color = colorParse.rgb_to_b2color(colorParse.hex_to_rgb(pilot.shipColor))
 
-		self.contactHandler.add_spaceship(BoxSpaceship(
+		spaceship = BoxSpaceship(
 			self.world,
 			pilot,
 			self.spaceshipHealth,
 			self.spaceshipMaxEnergy,
 			ship_color,
 			pos,
-			random.uniform(-math.pi, math.pi)))
+			angle,
+			self.shipStates)
+		self.contactHandler.add_spaceship(spaceship)
+		return spaceship
 
 	def update(self):
+		"""
+		Plays a game tick. With pipelined pilots, this applies the actions of the previous tick
+		and starts the pilots of this tick, which are finished by advance_pending_tick() and the next update().
+		"""
+		if not self.pipelinePilots:
+			self.finish_tick(self.begin_tick())
+			return
+		if self.pendingTick:
+			self.finish_pending_tick()
+		self.pendingTick = self.start_pilots(self.begin_tick())
+
+	def advance_pending_tick(self):
+		"""
+		Called on the physics steps between game ticks: resolves the scans of the pending tick
+		as soon as all pilots prepared them, and starts their updates.
+		"""
+		tick = self.pendingTick
+		if tick and tick.isScanning and tick.are_calls_done():
+			self.resolve_scans(tick)
+
+	def finish_pending_tick(self):
+		"""
+		Waits for the pilots of the pending tick and applies the actions of the spaceships still alive.
+		"""
+		tick = self.pendingTick
+		self.pendingTick = None
+		if tick.isScanning:
+			self.resolve_scans(tick)
+		self.apply_actions(tick, True)
+
+	def begin_tick(self) -> np.ndarray:
+		"""
+		First half of a game tick: syncs the spaceship states and applies time penalty and energy regeneration.
+		:return: indices of the spaceships alive in this tick
+		"""
+		states = self.shipStates
+		alive = states.alive_indices()
+		states.sync(alive, self.ticksPerSecond)
+
 		if self.gameTick > self.timePenaltyStart:
-			for spaceship in list(self.contactHandler.spaceships):
-				self.contactHandler.damage_spaceship(spaceship, self.timPenaltyDmg)
+			states.health[alive] = np.maximum(0, states.health[alive] - self.timPenaltyDmg)
+			for i in alive[states.health[alive] <= 0]:
+				self.contactHandler.destroy_spaceship(states.spaceships[i])
+			alive = alive[states.health[alive] > 0]
+		states.energy[alive] = np.minimum(states.maxEnergy[alive], states.energy[alive] + self.energyPerTick)
+		return alive
 
-		scan_results = {}
-		for spaceship in self.contactHandler.spaceships:
-			spaceship.add_energy(self.energyPerTick)
+	def finish_tick(self, alive: np.ndarray):
+		"""
+		Second half of a game tick: runs scans and pilots of the alive spaceships and applies their actions.
+		"""
+		tick = self.start_pilots(alive)
+		self.resolve_scans(tick)
+		self.apply_actions(tick)
 
+	def start_pilots(self, alive: np.ndarray) -> PilotTick:
+		"""
+		Starts prepare_scan of all sandboxed pilots of the alive spaceships.
+		"""
+		states = self.shipStates
+		spaceships = [states.spaceships[i] for i in alive]
+		# one location per spaceship and tick, shared by scans, pilots and scan visuals
+		tick = PilotTick(spaceships, set(self.externalSpaceships), states.create_locations(alive))
+		self.start_pilot_calls(tick, "prepare_scan", self.get_scan_args)
+		return tick
+
+	def resolve_scans(self, tick: PilotTick):
+		"""
+		Runs prepare_scan of the other pilots, resolves all scans and starts update of all sandboxed pilots.
+		Spaceships destroyed since the tick started, e.g. between the ticks of pipelined pilots, neither scan nor are found.
+		"""
+		spaceships = tick.spaceships
+		locations = tick.locations
+		external = tick.external
+		scans = {}
+		scan_results = tick.scanResults
+		scan_calls = self.run_async_pilots(tick, "prepare_scan", self.get_scan_args)
+		scan_calls.update(tick.collect_calls())
+		for spaceship in spaceships:
+			if spaceship not in external:
+				scan_results[spaceship] = []
+		# indices of the spaceships that are still alive
+		alive = [i for i, spaceship in enumerate(spaceships) if spaceship in self.contactHandler.spaceships]
+		for j, i in enumerate(alive):
+			spaceship = spaceships[i]
+			if spaceship in external:
+				continue
 			try:
-				scan = spaceship.prepare_scan(self.gameTick, self.ticksPerSecond)
+				scan = scan_calls[i].result() if i in scan_calls else spaceship.prepare_scan(self.gameTick, locations[i])
 			except Exception:
 				trace_exception(spaceship)
 				continue
-			located_spaceships = []
 			if scan:
 				scan.distance = min(50, scan.distance)
-				located_spaceships = self.handle_pilot_scan(spaceship, scan)
-			random.shuffle(located_spaceships)
-			scan_results[spaceship] = located_spaceships
+				if self.is_scan_affordable(spaceship, scan):
+					scans[j] = scan
 
-		for spaceship in self.contactHandler.spaceships:
+		alive_spaceships = [spaceships[i] for i in alive]
+		alive_locations = [locations[i] for i in alive]
+		for j, located_spaceships in self.handle_pilot_scans(alive_spaceships, alive_locations, scans).items():
+			scan_results[alive_spaceships[j]] = located_spaceships
+		for located_spaceships in scan_results.values():
+			self.random.shuffle(located_spaceships)
+
+		tick.isScanning = False
+		self.start_pilot_calls(tick, "update", self.get_update_args)
+
+	def apply_actions(self, tick: PilotTick, only_alive: bool = False):
+		"""
+		Runs update of the other pilots and applies the actions of all pilots. Ends the game tick.
+		:param only_alive: whether to leave out spaceships destroyed since the tick started
+		"""
+		external = tick.external
+		scan_results = tick.scanResults
+		update_calls = self.run_async_pilots(tick, "update", self.get_update_args)
+		update_calls.update(tick.collect_calls())
+		actions = []
+		for i, (spaceship, location) in enumerate(zip(tick.spaceships, tick.locations)):
+			if spaceship in external:
+				continue
+			if only_alive and spaceship not in self.contactHandler.spaceships:
+				continue
 			try:
-				action = spaceship.update(self.gameTick, self.ticksPerSecond, scan_results[spaceship])
+				action = update_calls[i].result() if i in update_calls else spaceship.update(self.gameTick, location, scan_results[spaceship])
 			except Exception:
 				trace_exception(spaceship)
 				continue
-			self.handle_pilot_action(spaceship, action)
+			if action:
+				actions.append((spaceship, action))
+		self.handle_pilot_actions(actions, bool(external))
 		self.gameTick += 1
 
-	def handle_pilot_action(self, spaceship: BoxSpaceship, action: PilotAction):
-		if not action:
-			return
-		if action.acceleration is not None:
-			self.handle_pilot_move(spaceship, action.acceleration)
-		if action.shootAngle is not None:
-			self.handle_pilot_shoot(spaceship, action.shootAngle)
+		if self.recordDigests:
+			self.digests.append(self.calc_state_digest())
+
+	def get_scan_args(self, tick: PilotTick, i: int, spaceship: BoxSpaceship) -> tuple:
+		return self.gameTick, tick.locations[i], spaceship.health, spaceship.energy
+
+	def get_update_args(self, tick: PilotTick, i: int, spaceship: BoxSpaceship) -> tuple:
+		return self.gameTick, tick.locations[i], spaceship.health, spaceship.energy, tick.scanResults[spaceship]
+
+	def start_pilot_calls(self, tick: PilotTick, method: str, get_args: Callable[[PilotTick, int, BoxSpaceship], tuple]):
+		"""
+		Calls the same method of all sandboxed and hosted pilots of a tick at once, so that the tick takes as long as
+		the slowest pilot instead of all pilots together. Each pilot host gets one message for all its pilots.
+		The results are only applied afterwards in the order of the spaceships,
+		so the game plays the same as with pilots called one after another.
+		:param get_args: creates the arguments of the call from the tick, the index and the spaceship
+		"""
+		spaceships = tick.spaceships
+		sandboxed = []
+		hosted = {}
+		for i, spaceship in enumerate(spaceships):
+			if spaceship in tick.external:
+				continue
+			pilot = spaceship.pilot
+			if isinstance(pilot, SandboxedPilot):
+				sandboxed.append(i)
+			elif isinstance(pilot, HostedPilot):
+				hosted.setdefault(pilot.host, []).append(i)
+
+		if sandboxed and self.pilotSandbox:
+			tick.calls.append((sandboxed, self.pilotSandbox.start_calls(
+				[spaceships[i].pilot for i in sandboxed], method, [get_args(tick, i, spaceships[i]) for i in sandboxed])))
+		for host, indices in hosted.items():
+			tick.calls.append((indices, host.start_calls(
+				[spaceships[i].pilot for i in indices], method, [get_args(tick, i, spaceships[i]) for i in indices])))
+
+	def run_async_pilots(self, tick: PilotTick, method: str, get_args: Callable[[PilotTick, int, BoxSpaceship], tuple]) -> Dict[int, Future]:
+		"""
+		Runs the same coroutine of all async pilots of a tick at once and waits at most asyncPilotDeadline seconds.
+		Late pilots are cancelled and their last scan or action is used again. The same happens to pilots
+		whose coroutine was cancelled, e.g. by awaiting a future that was cancelled with a late call.
+		:return: the calls by index of their spaceship
+		"""
+		spaceships = tick.spaceships
+		indices = [i for i, spaceship in enumerate(spaceships) if spaceship not in tick.external and isinstance(spaceship.pilot, AsyncSpaceshipPilot)]
+		if not indices:
+			return {}
+		if not self.asyncLoop:
+			self.asyncLoop = asyncio.new_event_loop()
+		coroutines = [getattr(spaceships[i].pilot, method)(*get_args(tick, i, spaceships[i])) for i in indices]
+		tasks, late = self.asyncLoop.run_until_complete(run_with_deadline(coroutines, self.asyncPilotDeadline))
+
+		calls = {}
+		for i, task in zip(indices, tasks):
+			pilot = spaceships[i].pilot
+			call = Future()
+			if task in late or task.cancelled():
+				pilot.timeoutCount += 1
+				call.set_result(pilot.lastScan if method == "prepare_scan" else pilot.lastAction)
+			elif task.exception():
+				call.set_exception(task.exception())
+			else:
+				if method == "prepare_scan":
+					pilot.lastScan = task.result()
+				else:
+					pilot.lastAction = task.result()
+				call.set_result(task.result())
+			calls[i] = call
+		return calls
+
+	def calc_state_digest(self) -> str:
+		"""
+		Hashes position and velocity of every body and health and energy of every spaceship.
+		Two runs of a match diverged at the first tick their digests differ.
+		"""
+		values = []
+		for body in self.world.bodies:
+			pos = body.position
+			vel = body.linearVelocity
+			values.extend((pos.x, pos.y, vel.x, vel.y))
+			if isinstance(body.userData, BoxSpaceship):
+				values.extend((body.userData.health, body.userData.energy))
+		return hashlib.blake2b(struct.pack("<%dd" % len(values), *values), digest_size=8).hexdigest()
+
+	def handle_pilot_actions(self, actions: List[Tuple[BoxSpaceship, PilotAction]], include_external: bool = False):
+		"""
+		Applies the actions of all spaceships of a game tick. Move costs are calculated for all spaceships at once.
+		:param include_external: whether to also apply externalAccelerations and externalShootAngles
+		to the alive external spaceships
+		"""
+		moves = []
+		for spaceship, action in actions:
+			if action.acceleration is None:
+				continue
+			try:
+				moves.append((spaceship, np.asarray(action.acceleration, dtype=float).reshape(2)))
+			except (TypeError, ValueError):
+				print("Could not move spaceship with: " + str(action.acceleration) + ". Is this really a float vector?")
+		shots = [(spaceship, action.shootAngle) for spaceship, action in actions if action.shootAngle is not None]
+
+		if include_external:
+			for i, spaceship in enumerate(self.externalSpaceships):
+				if spaceship not in self.contactHandler.spaceships:
+					continue
+				if self.externalAccelerations[i, 0] != 0 or self.externalAccelerations[i, 1] != 0:
+					moves.append((spaceship, self.externalAccelerations[i]))
+				if not math.isnan(self.externalShootAngles[i]):
+					shots.append((spaceship, self.externalShootAngles[i]))
+
+		if moves:
+			self.handle_pilot_moves([move[0] for move in moves], np.array([move[1] for move in moves]))
+		for spaceship, shoot_angle in shots:
+			self.handle_pilot_shoot(spaceship, shoot_angle)
 
-	def handle_pilot_scan(self, spaceship: BoxSpaceship, scan: ScanAction):
+	def calc_scan_cost(self, scan: ScanAction) -> float:
+		return scanning.calc_scanned_area(scan.distance, scan.angle) * self.scanCostFactor
+
+	def is_scan_affordable(self, spaceship: BoxSpaceship, scan: ScanAction) -> bool:
 		try:
-			energy_cost = scanning.calc_scanned_area(scan.distance, scan.angle) * self.scanCostFactor
+			energy_cost = self.calc_scan_cost(scan)
 			if energy_cost < 0:
-				return []
+				return False
 		except ValueError as e:
 			print("Could not run scan with distance:", scan.distance, "amd angle", scan.angle)
-			return []
+			return False
 
 		if energy_cost > spaceship.energy:
 			print("Spaceship \"" + spaceship.name + "\ does not have enough energy for this scan.")
-			return []
-
-		located_rockets = scanning.calc_located_spaceships(
-			spaceship.get_location(self.ticksPerSecond),
-			scan.direction,
-			scan.distance,
-			scan.angle,
-			[other.get_location(self.ticksPerSecond) for other in self.contactHandler.spaceships if other != spaceship])
-
-		self.contactHandler.add_scan(BoxScan(
-			spaceship.get_location(self.ticksPerSecond).get_position(),
-			scan.direction,
-			scan.distance,
-			scan.angle,
-			self.scanSuccessColor if located_rockets else self.scanFailColor,
-			1.0 / self.ticksPerSecond))
-
-		spaceship.use_energy(energy_cost)
-		random.shuffle(located_rockets)
-		return located_rockets
-
-	def handle_pilot_move(self, spaceship: BoxSpaceship, acceleration: np.ndarray):
-		power = min(self.maxSpaceshipSpeedPerTick, np.linalg.norm(acceleration))
-		energy_cost = power * self.moveCostFactor
+			return False
+		return True
 
-		if energy_cost > spaceship.energy:
-			return
-		spaceship.use_energy(energy_cost)
-		try:
-			b2acc = b2Vec2(acceleration[0], acceleration[1])
-			spaceship.move(b2acc, self.maxSpaceshipSpeedPerTick, self.ticksPerSecond)
-		except TypeError as e:
-			print("Could not move spaceship with: " + str(acceleration) + ". Is this really a float vector?")
+	def handle_pilot_scans(self, spaceships: List[BoxSpaceship], locations: List[Location], scans: Dict[int, ScanAction]) -> Dict[int, List[Location]]:
+		"""
+		Resolves all scans of a game tick against one array of spaceship positions.
+		:param spaceships: all spaceships in the game
+		:param locations: location of each spaceship in this tick
+		:param scans: affordable scans by index of the scanning spaceship
+		:return: located spaceships by index of the scanning spaceship
+		"""
+		if not scans:
+			return {}
+		scanner_indices = list(scans.keys())
+		positions = np.array([location.get_position() for location in locations])
+		scan_params = (
+			scanner_indices,
+			[scan.direction for scan in scans.values()],
+			[scan.distance for scan in scans.values()],
+			[scan.angle for scan in scans.values()])
+
+		if len(spaceships) >= self.scanGridMinSpaceships:
+			self.scanGrid.rebuild(positions)
+			located_indices = scanning.calc_located_spaceships_grid(self.scanGrid, positions, *scan_params)
+		else:
+			located_indices = scanning.calc_located_spaceships_batch(positions, *scan_params)
+
+		scan_results = {}
+		for i, scan, located in zip(scanner_indices, scans.values(), located_indices):
+			spaceship = spaceships[i]
+			located_spaceships = [locations[j] for j in located]
+
+			self.contactHandler.add_scan(BoxScan(
+				locations[i].get_position(),
+				scan.direction,
+				scan.distance,
+				scan.angle,
+				self.scanSuccessColor if located_spaceships else self.scanFailColor,
+				self.contactHandler.stepCount,
+				self.contactHandler.seconds_to_steps(1.0 / self.ticksPerSecond)))
+
+			spaceship.use_energy(self.calc_scan_cost(scan))
+			scan_results[i] = located_spaceships
+		return scan_results
+
+	def handle_pilot_moves(self, spaceships: List[BoxSpaceship], accelerations: np.ndarray):
+		"""
+		Accelerates spaceships that have enough energy for it.
+		:param accelerations: (n, 2) array with the acceleration of each spaceship
+		"""
+		states = self.shipStates
+		indices = np.array([spaceship.index for spaceship in spaceships])
+		power = np.minimum(self.maxSpaceshipSpeedPerTick, np.linalg.norm(accelerations, axis=1))
+		energy_costs = power * self.moveCostFactor
+
+		is_affordable = energy_costs <= states.energy[indices]
+		states.energy[indices[is_affordable]] = np.maximum(0, states.energy[indices[is_affordable]] - energy_costs[is_affordable])
+
+		for i in np.flatnonzero(is_affordable):
+			b2acc = b2Vec2(accelerations[i, 0], accelerations[i, 1])
+			spaceships[i].move(b2acc, self.maxSpaceshipSpeedPerTick, self.ticksPerSecond)
 
 	def handle_pilot_shoot(self, spaceship: BoxSpaceship, shoot_angle: float):
 		if self.shootCost > spaceship.energy:
 			return
 		spaceship.use_energy(self.shootCost)
 		direction = angle_to_b2vec(shoot_angle) * self.rocketSpeed
-		self.contactHandler.add_rocket(BoxRocket(self.world, spaceship, direction))
+		self.contactHandler.launch_rocket(spaceship, direction)
+
+
+def print_spawn_error(pilot_class):
+	print("Could not create spaceship \"" + pilot_class.__name__ + "\":")
+	print(traceback.format_exc())
 
 
 def trace_exception(spaceship: BoxSpaceship):
+	spaceship.crashCount += 1
 	spaceship.color = b2Color(1, 0, 0)
 	print("Spaceship \"" + spaceship.name + "\" encountered technical difficulties:")
 	print(traceback.format_exc())
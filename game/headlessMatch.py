@@ -0,0 +1,304 @@
+import inspect
+import pickle
+import sys
+from typing import List, Optional, Tuple
+
+from Box2D import b2World, b2Vec2
+
+from game.boxBorder import BoxBorder
+from game.boxContactListener import BoxContactListener
+from game.boxSpaceship import BoxSpaceship
+from game.gameHandler import GameHandler
+from game.pilotSandbox import PilotSandbox
+from render.settings import fwSettings
+from spaceshipPilot import SpaceshipPilot
+from util import fileLoad
+
+
+class ShipResult:
+
+	def __init__(self, name: str, health: float, energy: float, timeouts: int = 0, crashes: int = 0):
+		"""
+		Final state of one spaceship at the end of a match.
+		:param timeouts: number of pilot calls that missed their deadline in a pilot sandbox
+		:param crashes: number of pilot calls that raised an exception or found the pilot process ended
+		"""
+		self.name = name
+		self.health = health
+		self.energy = energy
+		self.timeouts = timeouts
+		self.crashes = crashes
+
+	def __repr__(self):
+		return "(" + self.name + ", health: " + str(self.health) + ", energy: " + str(self.energy) + ", timeouts: " + str(self.timeouts) + ", crashes: " + str(self.crashes) + ")"
+
+
+class MatchResult:
+
+	def __init__(
+			self,
+			winner: Optional[str],
+			ticks: int,
+			ships: List[ShipResult],
+			seed: int,
+			digests: List[str] = None,
+			contact_callbacks: int = 0,
+			start_world_counts: Tuple[int, int] = (0, 0),
+			end_world_counts: Tuple[int, int] = (0, 0)):
+		"""
+		Outcome of a headless match.
+		:param winner: name of the last spaceship alive or None if the match ended in a tie
+		:param ticks: number of game ticks the match lasted
+		:param ships: final health and energy of every spawned spaceship in spawn order
+		:param seed: seed the match was played with
+		:param digests: state digest after every game tick, if they were recorded
+		:param contact_callbacks: number of contacts Box2D reported to Python during the match
+		:param start_world_counts: number of bodies and contacts in the world before spawning spaceships
+		:param end_world_counts: number of bodies and contacts in the world at the end of the match
+		"""
+		self.winner = winner
+		self.ticks = ticks
+		self.ships = ships
+		self.seed = seed
+		self.digests = digests if digests is not None else []
+		self.contactCallbacks = contact_callbacks
+		self.startWorldCounts = start_world_counts
+		self.endWorldCounts = end_world_counts
+
+	def is_tie(self) -> bool:
+		return self.winner is None
+
+	def __repr__(self):
+		return "(winner: " + str(self.winner) + ", ticks: " + str(self.ticks) + ", ships: " + str(self.ships) + ")"
+
+
+class HeadlessMatch:
+
+	def __init__(
+			self,
+			pilot_classes: List,
+			game_size: int = 100,
+			ticks_per_second: int = 5,
+			hz: int = 60,
+			velocity_iterations: int = 8,
+			position_iterations: int = 3,
+			max_ticks: Optional[int] = None,
+			seed: Optional[int] = None,
+			record_digests: bool = False,
+			settings: Optional[fwSettings] = None,
+			pilot_sandbox: Optional[PilotSandbox] = None):
+		"""
+		Runs a match without a window, menus or pyglet clock. The simulation is stepped as fast as possible
+		with the same physics and game tick rules as SpaceJam.
+		:param pilot_classes: spaceship pilot classes to create one spaceship each for
+		:param max_ticks: optional limit of game ticks after which the match is ended as a tie
+		:param seed: seed for spawns, scan results and pilot random generators, a random one is chosen if None
+		:param record_digests: whether to record a digest of the game state after every game tick
+		:param settings: physics options of the world, replaces hz and the iteration counts if given
+		:param pilot_sandbox: hosts each pilot in its own process if given, the caller has to close it after the match
+		"""
+		if settings is None:
+			settings = fwSettings(hz=hz, velocityIterations=velocity_iterations, positionIterations=position_iterations)
+		self.settings = settings
+		self.gameSize = game_size
+		self.ticksPerSecond = ticks_per_second
+		self.hz = int(settings.hz)
+		self.velocityIterations = settings.velocityIterations
+		self.positionIterations = settings.positionIterations
+		self.maxTicks = max_ticks
+		self.stepCount = 0
+
+		self.world = b2World(gravity=(0, 0), doSleep=True)
+		self.world.warmStarting = settings.enableWarmStarting
+		self.world.continuousPhysics = settings.enableContinuous
+		self.world.subStepping = settings.enableSubStepping
+		self.border = BoxBorder(self.world, self.gameSize, 1)
+
+		self.contactHandler = BoxContactListener(self.world, self.hz)
+		self.world.contactListener = self.contactHandler
+		self.gameHandler = GameHandler(self.world, self.contactHandler, self.gameSize, self.ticksPerSecond, seed)
+		self.gameHandler.recordDigests = record_digests
+		self.gameHandler.pilotSandbox = pilot_sandbox
+		self.gameHandler.pipelinePilots = settings.pipelinePilots
+		self.gameHandler.asyncPilotDeadline = settings.pilotDeadline
+
+		self.startWorldCounts = self.contactHandler.start_match()
+		self.spaceships: List[BoxSpaceship] = self.gameHandler.spawn_pilots(pilot_classes)
+
+	def is_over(self) -> bool:
+		if len(self.contactHandler.spaceships) < 2:
+			return True
+		return self.maxTicks is not None and self.gameHandler.gameTick >= self.maxTicks
+
+	def step(self):
+		"""
+		Advances the simulation by one physics step, running a game tick every hz / ticks_per_second steps.
+		"""
+		self.step_world()
+		if self.is_tick_step():
+			self.gameHandler.update()
+		else:
+			self.gameHandler.advance_pending_tick()
+		self.contactHandler.end_step()
+
+	def step_world(self):
+		"""
+		First part of step(): moves all bodies and applies their contacts.
+		"""
+		self.stepCount += 1
+		self.world.Step(1.0 / self.hz, self.velocityIterations, self.positionIterations)
+		self.world.ClearForces()
+		self.contactHandler.after_world_step()
+
+	def is_tick_step(self) -> bool:
+		return self.stepCount % (self.hz // self.ticksPerSecond) == 0
+
+	def run(self) -> MatchResult:
+		while not self.is_over():
+			self.step()
+		self.gameHandler.close_async_loop()
+		return self.get_result()
+
+	def checkpoint(self) -> bytes:
+		"""
+		Serializes the complete match state between two steps, including the pilot objects.
+		Effects like scans and explosions are not saved, as they do not affect the game.
+		Pilots loaded with util.fileLoad are saved with the path of their module, so that restore can load it again
+		in another process before unpickling them.
+		Matches with pipelined pilots can't be checkpointed while pilots are thinking.
+		"""
+		if self.gameHandler.pendingTick:
+			raise ValueError("Can't checkpoint a match while pipelined pilots are thinking.")
+		ships = []
+		for ship in self.spaceships:
+			body = ship.body
+			is_alive = ship in self.contactHandler.spaceships
+			ships.append({
+				"pilot": ship.pilot,
+				"alive": is_alive,
+				"position": tuple(body.position) if is_alive else None,
+				"angle": body.angle if is_alive else None,
+				"velocity": tuple(body.linearVelocity) if is_alive else None,
+				"health": float(ship.health),
+				"energy": float(ship.energy),
+				"crashes": ship.crashCount})
+
+		rockets = []
+		# sorted by contact id to create the rocket bodies in the same order as before
+		for rocket in sorted(self.contactHandler.rockets, key=lambda r: r.contactId):
+			rockets.append((rocket.shooter.index, tuple(rocket.body.position), tuple(rocket.body.linearVelocity)))
+
+		# modules of loaded pilots are only registered in processes that loaded them
+		modules = {}
+		for ship in self.spaceships:
+			module_name = type(ship.pilot).__module__
+			if module_name.startswith("pilots."):
+				modules[module_name] = inspect.getfile(type(ship.pilot))
+
+		state = pickle.dumps({
+			"settings": (
+				self.gameSize, self.ticksPerSecond, self.settings,
+				self.maxTicks, self.gameHandler.recordDigests),
+			"stepCount": self.stepCount,
+			"effectStepCount": self.contactHandler.stepCount,
+			"contactCallbackCount": self.contactHandler.contactCallbackCount,
+			"gameTick": self.gameHandler.gameTick,
+			"seed": self.gameHandler.seed,
+			"random": self.gameHandler.random.getstate(),
+			"digests": list(self.gameHandler.digests),
+			"startWorldCounts": self.startWorldCounts,
+			"ships": ships,
+			"rockets": rockets})
+		return pickle.dumps({"modules": modules, "state": state})
+
+	@staticmethod
+	def restore(checkpoint: bytes) -> "HeadlessMatch":
+		"""
+		Creates a match in a fresh world from a checkpoint that continues where the checkpoint was taken.
+		Box2D does not expose its contact cache, so the restored match only continues exactly like the original
+		if no contacts were open at the checkpoint (world.contactCount is 0). Otherwise it can play out differently.
+		Matches restored from the same checkpoint always play out the same way.
+		"""
+		checkpoint = pickle.loads(checkpoint)
+		for module_name, path in checkpoint["modules"].items():
+			if module_name not in sys.modules:
+				fileLoad.load_external_module(path)
+		state = pickle.loads(checkpoint["state"])
+		game_size, ticks_per_second, settings, max_ticks, record_digests = state["settings"]
+		match = HeadlessMatch(
+			[], game_size, ticks_per_second,
+			max_ticks=max_ticks, seed=state["seed"], record_digests=record_digests, settings=settings)
+
+		game_handler = match.gameHandler
+		contact_handler = match.contactHandler
+		for ship_state in state["ships"]:
+			if ship_state["alive"]:
+				ship = match.place_spaceship(
+					ship_state["pilot"], ship_state["position"], ship_state["angle"], ship_state["velocity"],
+					ship_state["health"], ship_state["energy"])
+			else:
+				ship = match.place_spaceship(ship_state["pilot"], (0, 0), 0, (0, 0), ship_state["health"], ship_state["energy"])
+				contact_handler.spaceships.pop(ship)
+				match.world.DestroyBody(ship.body)
+			ship.crashCount = ship_state["crashes"]
+
+		for shooter_index, position, velocity in state["rockets"]:
+			match.place_rocket(match.spaceships[shooter_index], position, velocity)
+
+		match.stepCount = state["stepCount"]
+		contact_handler.stepCount = state["effectStepCount"]
+		contact_handler.contactCallbackCount = state["contactCallbackCount"]
+		game_handler.gameTick = state["gameTick"]
+		game_handler.random.setstate(state["random"])
+		game_handler.digests = state["digests"]
+		match.startWorldCounts = state["startWorldCounts"]
+		return match
+
+	def place_spaceship(
+			self,
+			pilot: SpaceshipPilot,
+			position: Tuple[float, float],
+			angle: float,
+			velocity: Tuple[float, float],
+			health: float,
+			energy: float) -> BoxSpaceship:
+		"""
+		Adds a spaceship with the given state instead of a random spawn.
+		:param velocity: velocity in game units per second
+		"""
+		ship = self.gameHandler.spawn_spaceship(pilot, b2Vec2(position), angle)
+		ship.body.linearVelocity = velocity
+		ship.health = health
+		ship.energy = energy
+		self.spaceships.append(ship)
+		return ship
+
+	def place_rocket(self, shooter: BoxSpaceship, position: Tuple[float, float], velocity: Tuple[float, float]):
+		"""
+		Adds a rocket of the shooter that is already on its way.
+		:param velocity: velocity in game units per second
+		"""
+		self.contactHandler.launch_rocket(shooter, b2Vec2(velocity), b2Vec2(position))
+
+	def fork(self) -> "HeadlessMatch":
+		"""
+		Creates an independent copy of the match, e.g. for trying out different continuations.
+		"""
+		return HeadlessMatch.restore(self.checkpoint())
+
+	def get_result(self) -> MatchResult:
+		winner = None
+		if len(self.contactHandler.spaceships) == 1:
+			winner = next(iter(self.contactHandler.spaceships)).name
+		return MatchResult(
+			winner,
+			self.gameHandler.gameTick,
+			[ShipResult(
+				ship.name, float(ship.health), float(ship.energy),
+				ship.pilot.timeoutCount if hasattr(ship.pilot, "timeoutCount") else 0,
+				ship.crashCount) for ship in self.spaceships],
+			self.gameHandler.seed,
+			list(self.gameHandler.digests),
+			self.contactHandler.contactCallbackCount,
+			self.startWorldCounts,
+			self.contactHandler.get_world_counts())
@@ -0,0 +1,171 @@
+import random
+import subprocess
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import List, Optional
+
+from game import pilotProtocol
+from game.pilotSandbox import PilotCrashError
+from location import Location
+from pilotAction import PilotAction, ScanAction
+from spaceshipPilot import SpaceshipPilot
+
+
+class PilotHost:
+
+	def __init__(self, command: List[str], name: str, timeout: Optional[float] = 5.0):
+		"""
+		Runs pilots in another process that speaks the binary protocol of game/pilotProtocol.py over its stdin and stdout,
+		e.g. ["python", "-m", "game.pilotHost", "bots/orbiter.py"] or a bot written for another runtime.
+		All pilots of a host are called with one message per game tick and method. Close the host after the match.
+		:param name: name of the spaceships of the hosted pilots
+		:param timeout: seconds the host may take to answer a message, a host that takes longer is stopped
+		and its pilots crash. Waits forever if None
+		"""
+		self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+		self.pilotName = name
+		self.timeout = timeout
+		self.pilotCount = 0
+		self._hasEnded = False
+
+	def create_pilot_class(self) -> type:
+		"""
+		:return: a pilot class for HeadlessMatch or GameHandler.spawn_pilots whose pilots are hosted by this host
+		"""
+		return type(self.pilotName, (HostedPilot,), {"host": self})
+
+	def start_calls(self, pilots: List["HostedPilot"], method: str, args_list: List[tuple]) -> "HostCalls":
+		return HostCalls(self, pilots, method, args_list)
+
+	def _send(self, kind: int, game_tick: int, slots: List[int], args_list: List[tuple]):
+		pilotProtocol.write_frame(self.process.stdin, pilotProtocol.encode_request(kind, game_tick, slots, args_list))
+
+	def _receive(self) -> list:
+		"""
+		:raise TimeoutError: if the host did not answer within timeout seconds
+		"""
+		if self.timeout is not None and not wait([self.process.stdout], self.timeout):
+			raise TimeoutError()
+		kind, results = pilotProtocol.decode_reply(pilotProtocol.read_frame(self.process.stdout))
+		return results
+
+	def _end(self, is_hanging: bool = False) -> PilotCrashError:
+		self._hasEnded = True
+		if is_hanging:
+			# its late answers would be taken for the answers of the next messages
+			self.process.kill()
+			self.process.wait()
+			return PilotCrashError("The host of pilot \"" + self.pilotName + "\" did not answer within " + str(self.timeout) + " seconds and was stopped.")
+		# the pipe closes shortly before the process has exited
+		try:
+			self.process.wait(1)
+		except subprocess.TimeoutExpired:
+			pass
+		return PilotCrashError("The host of pilot \"" + self.pilotName + "\" ended with exit code " + str(self.process.returncode) + ".")
+
+	def close(self):
+		self._hasEnded = True
+		try:
+			self.process.stdin.close()
+			self.process.wait(1)
+		except (OSError, subprocess.TimeoutExpired):
+			self.process.kill()
+			self.process.wait()
+		self.process.stdout.close()
+
+
+class HostCalls:
+
+	def __init__(self, host: PilotHost, pilots: List["HostedPilot"], method: str, args_list: List[tuple]):
+		"""
+		Sends the calls of the same method of several pilots of a host as one message.
+		:param args_list: arguments of the call for each pilot, starting with the game tick
+		"""
+		self.host = host
+		self.futures = [Future() for _ in pilots]
+		self._isSent = False
+		if host._hasEnded:
+			return
+		kind = pilotProtocol.PREPARE_SCAN if method == "prepare_scan" else pilotProtocol.UPDATE
+		try:
+			host._send(kind, args_list[0][0], [pilot.slot for pilot in pilots], [args[1:] for args in args_list])
+			self._isSent = True
+		except OSError:
+			self._set_crashed(host._end())
+
+	def is_done(self) -> bool:
+		"""
+		:return: whether the answer of the host started to arrive
+		"""
+		return not self._isSent or bool(wait([self.host.process.stdout], 0))
+
+	def collect(self) -> List[Future]:
+		"""
+		Waits for the answer of the host, at most timeout seconds of the host.
+		:return: one future per pilot with the result of its call,
+		or a PilotCrashError if the pilot raised an exception or the host ended or did not answer in time
+		"""
+		if not self._isSent:
+			for future in self.futures:
+				if not future.done():
+					future.set_result(None)
+			return self.futures
+		self._isSent = False
+		try:
+			results = self.host._receive()
+		except TimeoutError:
+			self._set_crashed(self.host._end(True))
+			return self.futures
+		except (EOFError, OSError):
+			self._set_crashed(self.host._end())
+			return self.futures
+		for future, (slot, result, failed) in zip(self.futures, results):
+			if failed:
+				future.set_exception(PilotCrashError("Pilot \"" + self.host.pilotName + "\" raised an exception in its host."))
+			else:
+				future.set_result(result)
+		return self.futures
+
+	def _set_crashed(self, error: PilotCrashError):
+		for future in self.futures:
+			future.set_exception(error)
+
+
+class HostedPilot(SpaceshipPilot):
+	# host of the pilots of this class, set by PilotHost.create_pilot_class
+	host: Optional[PilotHost] = None
+
+	def __init__(self, seed: Optional[int] = None):
+		"""
+		A pilot that runs in a PilotHost. Create its class with PilotHost.create_pilot_class.
+		:param seed: seed of the random generator of the hosted pilot, a random one is chosen if None
+		"""
+		host = self.host
+		if seed is None:
+			seed = random.getrandbits(64)
+		self.slot = host.pilotCount
+		self.pilotName = host.pilotName
+		if host._hasEnded:
+			raise PilotCrashError("The host of pilot \"" + self.pilotName + "\" has ended.")
+		try:
+			host._send(pilotProtocol.CREATE, 0, [self.slot], [seed])
+			_, ship_color, failed = host._receive()[0]
+		except TimeoutError:
+			raise host._end(True)
+		except (EOFError, OSError):
+			raise host._end()
+		if failed:
+			raise PilotCrashError("Pilot \"" + self.pilotName + "\" could not be created in its host.")
+		host.pilotCount += 1
+		super().__init__(ship_color)
+
+	@classmethod
+	def create_seeded(cls, seed: int) -> "HostedPilot":
+		# the random generator of the pilot lives in its host
+		return cls(seed)
+
+	def prepare_scan(self, game_tick: int, current_location: Location, current_health: float, current_energy: float) -> ScanAction:
+		return HostCalls(self.host, [self], "prepare_scan", [(game_tick, current_location, current_health, current_energy)]).collect()[0].result()
+
+	def update(self, game_tick: int, current_location: Location, current_health: float, current_energy: float, located_spaceships: List[Location]) -> PilotAction:
+		return HostCalls(self.host, [self], "update", [(game_tick, current_location, current_health, current_energy, located_spaceships)]).collect()[0].result()
@@ -0,0 +1,93 @@
+import argparse
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from game.headlessMatch import HeadlessMatch
+from render.settings import fwSettings
+from util import fileLoad
+
+
+def parse_clone_arg(arg: str) -> Tuple[str, int]:
+	"""
+	Parses a pilot argument like "bots/orbiter.py:100" into the module path and the number of clones (1 if omitted).
+	"""
+	path, _, count = arg.rpartition(":")
+	if not path or not count.isdigit():
+		return arg, 1
+	return path, int(count)
+
+
+class MassBattleReport:
+
+	def __init__(self, spaceship_count: int, survivors: int, ticks: int, tick_times: List[float], budget: float):
+		"""
+		Outcome and speed of a mass battle.
+		:param tick_times: seconds each game tick took, including its physics steps
+		:param budget: seconds a game tick may take to play in real time
+		"""
+		self.spaceshipCount = spaceship_count
+		self.survivors = survivors
+		self.ticks = ticks
+		self.tickTimes = tick_times
+		self.budget = budget
+
+	def get_mean_tick_time(self) -> float:
+		return sum(self.tickTimes) / len(self.tickTimes) if self.tickTimes else 0
+
+	def get_max_tick_time(self) -> float:
+		return max(self.tickTimes) if self.tickTimes else 0
+
+	def get_ticks_over_budget(self) -> int:
+		return sum(1 for tick_time in self.tickTimes if tick_time > self.budget)
+
+
+def run_mass_battle(
+		pilot_classes: List,
+		game_size: int,
+		max_ticks: Optional[int] = None,
+		seed: Optional[int] = None,
+		settings: Optional[fwSettings] = None) -> MassBattleReport:
+	"""
+	Plays a headless match with many spaceships and measures how long each game tick takes.
+	:param pilot_classes: one pilot class per spaceship, the same class can be given many times
+	:param settings: physics options of the battle, the defaults if None
+	"""
+	match = HeadlessMatch(pilot_classes, game_size, max_ticks=max_ticks, seed=seed, settings=settings)
+	steps_per_tick = match.hz // match.ticksPerSecond
+	tick_times = []
+
+	while not match.is_over():
+		start = time.perf_counter()
+		for _ in range(steps_per_tick):
+			match.step()
+		tick_times.append(time.perf_counter() - start)
+	return MassBattleReport(len(match.spaceships), len(match.contactHandler.spaceships), match.gameHandler.gameTick, tick_times, 1.0 / match.ticksPerSecond)
+
+
+def main(argv: List[str]):
+	parser = argparse.ArgumentParser(prog="spaceJam.py --mass-battle", description="Plays a headless match with many cloned spaceships.")
+	parser.add_argument("--mass-battle", action="store_true", help=argparse.SUPPRESS)
+	parser.add_argument("pilots", nargs="+", help="paths of pilot modules with the number of clones, e.g. bots/orbiter.py:250")
+	parser.add_argument("--size", type=int, default=600, help="width and height of the game field")
+	parser.add_argument("--max-ticks", type=int, default=300, help="game ticks after which the battle ends")
+	parser.add_argument("--seed", type=int, default=None, help="seed of the battle")
+	parser.add_argument("--fast-physics", action="store_true", help="use fewer physics steps and solver iterations, see render/settings.py")
+	args = parser.parse_args(argv)
+
+	pilot_classes = []
+	try:
+		for arg in args.pilots:
+			path, count = parse_clone_arg(arg)
+			pilot_classes.extend([fileLoad.load_class_by_module_name(path)] * count)
+		report = run_mass_battle(pilot_classes, args.size, args.max_ticks, args.seed, fwSettings(fastPhysics=args.fast_physics))
+	except ValueError as e:
+		parser.error(str(e))
+
+	print(str(report.spaceshipCount) + " spaceships, " + str(report.survivors) + " left after " + str(report.ticks) + " ticks")
+	print("tick time: %.1f ms mean, %.1f ms max, budget %.0f ms, %d ticks over budget" % (
+		report.get_mean_tick_time() * 1000, report.get_max_tick_time() * 1000, report.budget * 1000, report.get_ticks_over_budget()))
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
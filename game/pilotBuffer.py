@@ -0,0 +1,158 @@
+from typing import List, Optional
+
+import numpy as np
+
+try:
+	from multiprocessing import shared_memory
+except ImportError:
+	# Python before 3.8, calls of sandboxed pilots are pickled then
+	shared_memory = None
+
+from location import Location
+from pilotAction import PilotAction, ScanAction
+
+# located spaceships that fit into an observation, calls with more of them are pickled instead
+MAX_LOCATED = 64
+
+OBSERVATION = np.dtype([
+	("sequence", np.uint64),
+	("gameTick", np.int64),
+	# position and velocity
+	("location", np.float64, (2, 2)),
+	("health", np.float64),
+	("energy", np.float64),
+	("locatedCount", np.int64),
+	("located", np.float64, (MAX_LOCATED, 2, 2))])
+
+ACTION = np.dtype([
+	("sequence", np.uint64),
+	("flags", np.uint8),
+	# direction, distance and angle of a scan or acceleration x, acceleration y and shoot angle of an action
+	("values", np.float64, 3)])
+
+# flags of actions
+HAS_RESULT = 1
+HAS_ACCELERATION = 2
+SHOOTS = 4
+
+
+class PilotBuffer:
+
+	def __init__(self, name: Optional[str] = None):
+		"""
+		Observation and action of a sandboxed pilot in shared memory, so that its calls don't need to be pickled.
+		The game writes an observation with the id of the call as sequence number and wakes the pilot process,
+		which reads the observation and writes its scan or action with the same sequence number.
+		:param name: name of the shared memory block to attach to, a new block is created if None
+		"""
+		self.memory = shared_memory.SharedMemory(name, name is None, OBSERVATION.itemsize + ACTION.itemsize)
+		self.name = self.memory.name
+		self.observation = np.ndarray((), OBSERVATION, self.memory.buf)
+		self.action = np.ndarray((), ACTION, self.memory.buf, OBSERVATION.itemsize)
+
+	def write_observation(
+			self,
+			sequence: int,
+			game_tick: int,
+			location: Location,
+			health: float,
+			energy: float,
+			located_spaceships: Optional[List[Location]] = None) -> bool:
+		"""
+		:param located_spaceships: located spaceships for update, None for prepare_scan
+		:return: False if there are too many located spaceships
+		"""
+		observation = self.observation
+		if located_spaceships is not None:
+			if len(located_spaceships) > MAX_LOCATED:
+				return False
+			located = observation["located"]
+			for i, located_location in enumerate(located_spaceships):
+				located[i, 0] = located_location.get_position()
+				located[i, 1] = located_location.get_velocity()
+			observation["locatedCount"] = len(located_spaceships)
+		observation["gameTick"] = game_tick
+		observation["location"][0] = location.get_position()
+		observation["location"][1] = location.get_velocity()
+		observation["health"] = health
+		observation["energy"] = energy
+		observation["sequence"] = sequence
+		return True
+
+	def read_observation(self, sequence: int, method: str) -> tuple:
+		"""
+		:return: arguments of prepare_scan or update, copied so that pilots can keep them
+		"""
+		observation = self.observation
+		if observation["sequence"] != sequence:
+			raise ValueError("Observation " + str(observation["sequence"]) + " is not the one of call " + str(sequence) + ".")
+		location = observation["location"]
+		args = (int(observation["gameTick"]), Location(location[0], location[1]), float(observation["health"]), float(observation["energy"]))
+		if method == "prepare_scan":
+			return args
+		located = observation["located"]
+		return args + ([Location(located[i, 0], located[i, 1]) for i in range(observation["locatedCount"])],)
+
+	def write_action(self, sequence: int, result) -> bool:
+		"""
+		:param result: scan or action returned by the pilot
+		:return: False if the result is something else and has to be pickled
+		"""
+		action = self.action
+		if result is None:
+			action["flags"] = 0
+		elif type(result) is ScanAction:
+			try:
+				action["values"] = (result.direction, result.distance, result.angle)
+			except (TypeError, ValueError):
+				return False
+			action["flags"] = HAS_RESULT
+		elif type(result) is PilotAction:
+			flags = HAS_RESULT
+			values = [0.0, 0.0, 0.0]
+			try:
+				if result.acceleration is not None:
+					values[0:2] = np.asarray(result.acceleration, dtype=float).reshape(2)
+					flags |= HAS_ACCELERATION
+				if result.shootAngle is not None:
+					values[2] = float(result.shootAngle)
+					flags |= SHOOTS
+			except (TypeError, ValueError):
+				return False
+			action["values"] = values
+			action["flags"] = flags
+		else:
+			return False
+		action["sequence"] = sequence
+		return True
+
+	def read_action(self, sequence: int, method: str):
+		"""
+		:return: the scan or action written for the call
+		"""
+		action = self.action
+		if action["sequence"] != sequence:
+			raise ValueError("Action " + str(action["sequence"]) + " is not the one of call " + str(sequence) + ".")
+		flags = int(action["flags"])
+		if not flags & HAS_RESULT:
+			return None
+		values = action["values"]
+		if method == "prepare_scan":
+			return ScanAction(float(values[0]), float(values[1]), float(values[2]))
+		result = PilotAction()
+		if flags & HAS_ACCELERATION:
+			result.move_spaceship_with_vec(values[0:2].copy())
+		if flags & SHOOTS:
+			result.shoot_rocket(float(values[2]))
+		return result
+
+	def close(self, unlink: bool = False):
+		"""
+		:param unlink: whether to also free the shared memory, done by the game that created it
+		"""
+		# numpy views have to be released before the memory can be closed
+		self.observation = None
+		self.action = None
+		self.memory.close()
+		if unlink:
+			self.memory.unlink()
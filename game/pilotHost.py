@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import traceback
+from typing import BinaryIO, Dict, List
+
+from game import pilotProtocol
+from spaceshipPilot import SpaceshipPilot
+from util import fileLoad
+
+
+def run_host(pilot_class, input: BinaryIO, output: BinaryIO):
+	"""
+	Hosts pilots of one class and answers the messages of the game until it closes the input.
+	"""
+	pilots: Dict[int, SpaceshipPilot] = {}
+	while True:
+		try:
+			body = pilotProtocol.read_frame(input)
+		except EOFError:
+			return
+		kind, game_tick, records = pilotProtocol.decode_request(body)
+		replies = []
+		for slot, args in records:
+			try:
+				if kind == pilotProtocol.CREATE:
+					pilots[slot] = pilot_class.create_seeded(args)
+					result = pilots[slot].shipColor if hasattr(pilots[slot], "shipColor") else "#FFFFFF"
+				elif kind == pilotProtocol.PREPARE_SCAN:
+					result = pilots[slot].prepare_scan(game_tick, *args)
+				else:
+					result = pilots[slot].update(game_tick, *args)
+				# a result that can not be encoded fails this call only, not the whole host
+				replies.append(pilotProtocol.encode_reply_record(kind, slot, result, False))
+			except Exception:
+				print(traceback.format_exc(), file=sys.stderr)
+				replies.append(pilotProtocol.encode_reply_record(kind, slot, None, True))
+		pilotProtocol.write_frame(output, pilotProtocol.join_reply(kind, replies))
+
+
+def main(argv: List[str]):
+	parser = argparse.ArgumentParser(
+		prog="python -m game.pilotHost",
+		description="Hosts Python pilots for a game in another process, see game/pilotProtocol.py.")
+	parser.add_argument("pilot", help="path of the pilot module")
+	args = parser.parse_args(argv)
+
+	# prints of pilots must not end up in the messages to the game
+	output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+	sys.stdout = sys.stderr
+	try:
+		pilot_class = fileLoad.load_class_by_module_name(args.pilot)
+	except ValueError as e:
+		parser.error(str(e))
+	run_host(pilot_class, sys.stdin.buffer, output)
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
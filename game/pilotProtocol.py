@@ -0,0 +1,190 @@
+import struct
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from location import Location
+from pilotAction import PilotAction, ScanAction
+
+# Binary protocol between the game and a pilot host, a process in any runtime that hosts one or more pilots.
+# All numbers are little-endian. Each message is a frame of its byte length as uint32 followed by the body.
+# A body starts with a header of the message kind, the game tick and the number of records that follow.
+# The game sends one message per kind and game tick with a record for each pilot of the host it calls,
+# the host answers with one record per request record in the same order.
+
+CREATE = 0
+PREPARE_SCAN = 1
+UPDATE = 2
+
+FRAME = struct.Struct("<I")
+# kind, game tick, record count
+REQUEST_HEADER = struct.Struct("<BIH")
+# kind, record count
+REPLY_HEADER = struct.Struct("<BH")
+
+# create: pilot slot, seed
+CREATE_REQUEST = struct.Struct("<HQ")
+# pilot slot, status, ship color as "#RRGGBB"
+CREATE_REPLY = struct.Struct("<HB7s")
+# prepare_scan: pilot slot, x, y, velocity x, velocity y, health, energy
+SCAN_REQUEST = struct.Struct("<H6d")
+# update: like prepare_scan followed by the number of located spaceships
+UPDATE_REQUEST = struct.Struct("<H6dH")
+# each located spaceship: x, y, velocity x, velocity y
+LOCATION = struct.Struct("<4d")
+# prepare_scan and update: pilot slot, flags, then direction, distance, angle of a scan
+# or acceleration x, acceleration y, shoot angle of an action
+ACTION_REPLY = struct.Struct("<HB3d")
+
+# flags of replies
+HAS_SCAN = 1
+HAS_ACCELERATION = 1
+SHOOTS = 2
+ERROR = 128
+
+
+def write_frame(output: BinaryIO, body: bytes):
+	output.write(FRAME.pack(len(body)) + body)
+	output.flush()
+
+
+def read_frame(input: BinaryIO) -> bytes:
+	"""
+	:raise EOFError: if the other side closed the connection
+	"""
+	header = _read_exactly(input, FRAME.size)
+	return _read_exactly(input, FRAME.unpack(header)[0])
+
+
+def _read_exactly(input: BinaryIO, size: int) -> bytes:
+	data = input.read(size)
+	while len(data) < size:
+		chunk = input.read(size - len(data))
+		if not chunk:
+			raise EOFError()
+		data += chunk
+	return data
+
+
+def encode_location(location: Location) -> Tuple[float, float, float, float]:
+	position = location.get_position()
+	velocity = location.get_velocity()
+	return float(position[0]), float(position[1]), float(velocity[0]), float(velocity[1])
+
+
+def decode_location(values) -> Location:
+	return Location(np.array(values[0:2], dtype=float), np.array(values[2:4], dtype=float))
+
+
+def encode_request(kind: int, game_tick: int, slots: List[int], args_list: List[tuple]) -> bytes:
+	"""
+	Encodes the calls of several pilots of a host.
+	:param args_list: for each pilot, the seed for CREATE or the arguments of prepare_scan or update without the game tick
+	"""
+	parts = [REQUEST_HEADER.pack(kind, game_tick, len(slots))]
+	for slot, args in zip(slots, args_list):
+		if kind == CREATE:
+			parts.append(CREATE_REQUEST.pack(slot, args))
+		elif kind == PREPARE_SCAN:
+			location, health, energy = args
+			parts.append(SCAN_REQUEST.pack(slot, *encode_location(location), health, energy))
+		else:
+			location, health, energy, located_spaceships = args
+			parts.append(UPDATE_REQUEST.pack(slot, *encode_location(location), health, energy, len(located_spaceships)))
+			parts.extend(LOCATION.pack(*encode_location(located)) for located in located_spaceships)
+	return b"".join(parts)
+
+
+def decode_request(body: bytes) -> Tuple[int, int, List[Tuple[int, tuple]]]:
+	"""
+	:return: kind, game tick and the slot and arguments of each record, see encode_request
+	"""
+	kind, game_tick, count = REQUEST_HEADER.unpack_from(body)
+	offset = REQUEST_HEADER.size
+	records = []
+	for _ in range(count):
+		if kind == CREATE:
+			slot, seed = CREATE_REQUEST.unpack_from(body, offset)
+			offset += CREATE_REQUEST.size
+			records.append((slot, seed))
+		elif kind == PREPARE_SCAN:
+			values = SCAN_REQUEST.unpack_from(body, offset)
+			offset += SCAN_REQUEST.size
+			records.append((values[0], (decode_location(values[1:5]), values[5], values[6])))
+		else:
+			values = UPDATE_REQUEST.unpack_from(body, offset)
+			offset += UPDATE_REQUEST.size
+			located_spaceships = []
+			for _ in range(values[7]):
+				located_spaceships.append(decode_location(LOCATION.unpack_from(body, offset)))
+				offset += LOCATION.size
+			records.append((values[0], (decode_location(values[1:5]), values[5], values[6], located_spaceships)))
+	return kind, game_tick, records
+
+
+def encode_reply(kind: int, results: List[Tuple[int, object, bool]]) -> bytes:
+	"""
+	:param results: slot, result and whether the call raised an exception for each request record.
+	The result is the ship color for CREATE, a ScanAction or a PilotAction
+	"""
+	return join_reply(kind, [encode_reply_record(kind, slot, result, failed) for slot, result, failed in results])
+
+
+def encode_reply_record(kind: int, slot: int, result: object, failed: bool) -> bytes:
+	"""
+	Encodes the answer to one request record, see encode_reply.
+	Raises an exception if the result does not fit the kind of the request.
+	"""
+	if kind == CREATE:
+		return CREATE_REPLY.pack(slot, ERROR if failed else 0, str(result or "#FFFFFF").encode("ascii"))
+	flags = 0
+	values = (0.0, 0.0, 0.0)
+	if failed:
+		flags = ERROR
+	elif result and kind == PREPARE_SCAN:
+		flags = HAS_SCAN
+		values = (result.direction, result.distance, result.angle)
+	elif result:
+		acceleration = (0.0, 0.0)
+		if result.acceleration is not None:
+			flags |= HAS_ACCELERATION
+			acceleration = np.asarray(result.acceleration, dtype=float).reshape(2)
+		if result.shootAngle is not None:
+			flags |= SHOOTS
+		values = (acceleration[0], acceleration[1], result.shootAngle if result.shootAngle is not None else 0.0)
+	return ACTION_REPLY.pack(slot, flags, *values)
+
+
+def join_reply(kind: int, records: List[bytes]) -> bytes:
+	"""
+	:param records: the request records answered with encode_reply_record
+	"""
+	return REPLY_HEADER.pack(kind, len(records)) + b"".join(records)
+
+
+def decode_reply(body: bytes) -> Tuple[int, List[Tuple[int, object, bool]]]:
+	"""
+	:return: kind and the slot, result and whether the call failed of each record, see encode_reply
+	"""
+	kind, count = REPLY_HEADER.unpack_from(body)
+	offset = REPLY_HEADER.size
+	results = []
+	for _ in range(count):
+		if kind == CREATE:
+			slot, status, color = CREATE_REPLY.unpack_from(body, offset)
+			offset += CREATE_REPLY.size
+			results.append((slot, color.decode("ascii"), bool(status & ERROR)))
+			continue
+		slot, flags, a, b, c = ACTION_REPLY.unpack_from(body, offset)
+		offset += ACTION_REPLY.size
+		result: Optional[object] = None
+		if kind == PREPARE_SCAN and flags & HAS_SCAN:
+			result = ScanAction(a, b, c)
+		elif kind == UPDATE and flags & (HAS_ACCELERATION | SHOOTS):
+			result = PilotAction()
+			if flags & HAS_ACCELERATION:
+				result.move_spaceship_with_vec(np.array([a, b]))
+			if flags & SHOOTS:
+				result.shoot_rocket(c)
+		results.append((slot, result, bool(flags & ERROR)))
+	return kind, results
@@ -0,0 +1,289 @@
+import asyncio
+import inspect
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import List, Optional
+
+try:
+	import resource
+except ImportError:
+	# not available on Windows, the memory of pilot processes is not limited there
+	resource = None
+
+from location import Location
+from pilotAction import PilotAction, ScanAction
+from spaceshipPilot import SpaceshipPilot
+from game.pilotBuffer import PilotBuffer, shared_memory
+from util import fileLoad
+
+
+class PilotCrashError(Exception):
+	"""
+	Raised in the game process when a sandboxed pilot raised an exception or its process ended.
+	"""
+
+
+def run_pilot(connection: Connection, module_path: str, class_name: str, seed: int, memory_limit: Optional[int], buffer_name: Optional[str] = None):
+	"""
+	Main function of a pilot process: creates the pilot and answers calls until the game closes the connection.
+	:param buffer_name: name of the PilotBuffer of the pilot, calls are only pickled if None
+	"""
+	buffer = PilotBuffer(buffer_name) if buffer_name else None
+	try:
+		pilot_class = getattr(fileLoad.load_external_module(module_path), class_name)
+		if resource and memory_limit:
+			resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+		pilot = pilot_class.create_seeded(seed)
+		connection.send((0, "ok", pilot.shipColor if hasattr(pilot, "shipColor") else "#FFFFFF"))
+	except Exception:
+		connection.send((0, "error", traceback.format_exc()))
+		return
+
+	# runs the coroutines of async pilots, the deadline is kept by the game process
+	loop = asyncio.new_event_loop()
+	while True:
+		try:
+			call_id, method, args = connection.recv()
+		except (EOFError, OSError):
+			if buffer:
+				buffer.close()
+			return
+		try:
+			if args is None:
+				args = buffer.read_observation(call_id, method)
+			result = getattr(pilot, method)(*args)
+			if inspect.iscoroutine(result):
+				result = loop.run_until_complete(result)
+		except Exception:
+			connection.send((call_id, "error", traceback.format_exc()))
+			continue
+		if buffer and buffer.write_action(call_id, result):
+			connection.send((call_id, "buffer", None))
+		else:
+			connection.send((call_id, "ok", result))
+
+
+class SandboxedPilot(SpaceshipPilot):
+
+	def __init__(self, pilot_class, seed: int, deadline: float, memory_limit: Optional[int], start_timeout: float, use_buffer: bool = True):
+		"""
+		Runs a pilot of the given class in its own process.
+		A call that misses the deadline returns None, so the spaceship does nothing in that game tick.
+		While the pilot is still busy with a late call, the next call is only sent once the late call finished,
+		and has to be answered within the same deadline.
+		:param deadline: seconds each call of prepare_scan and update may take
+		:param memory_limit: bytes of address space the pilot process may use, not limited if None
+		:param start_timeout: seconds the pilot process may take to start and create the pilot
+		:param use_buffer: whether to pass observations and actions through a PilotBuffer instead of pickling them
+		"""
+		# created before the process, so that the pilot process can attach to it
+		self.buffer = PilotBuffer() if use_buffer and shared_memory else None
+		context = multiprocessing.get_context("spawn")
+		self._connection, child_connection = context.Pipe()
+		self.process = context.Process(
+			target=run_pilot,
+			args=(child_connection, inspect.getfile(pilot_class), pilot_class.__name__, seed, memory_limit, self.buffer.name if self.buffer else None),
+			daemon=True)
+		self.process.start()
+		child_connection.close()
+
+		# name of the hosted pilot class, used as name of the spaceship
+		self.pilotName = pilot_class.__name__
+		self.deadline = deadline
+		# number of calls that missed their deadline or were skipped because the pilot was still busy with a late call
+		self.timeoutCount = 0
+		self._nextCallId = 1
+		# call whose answer is awaited, the pilot process answers its start as call 0
+		self._currentCallId = 0
+		self._currentMethod = None
+		# call that missed its deadline and is still running in the pilot process
+		self._lateCallId = None
+		self._hasEnded = False
+
+		try:
+			if not self._connection.poll(start_timeout):
+				raise PilotCrashError("Pilot \"" + self.pilotName + "\" did not start within " + str(start_timeout) + " seconds.")
+			_, ship_color = self._receive()
+		except (PilotCrashError, EOFError, OSError):
+			self.close()
+			raise
+		super().__init__(ship_color)
+
+	def prepare_scan(self, game_tick: int, current_location: Location, current_health: float, current_energy: float) -> ScanAction:
+		return call_pilots([self], "prepare_scan", [(game_tick, current_location, current_health, current_energy)], self.deadline)[0].result()
+
+	def update(self, game_tick: int, current_location: Location, current_health: float, current_energy: float, located_spaceships: List[Location]) -> PilotAction:
+		return call_pilots([self], "update", [(game_tick, current_location, current_health, current_energy, located_spaceships)], self.deadline)[0].result()
+
+	def _is_busy(self) -> bool:
+		return self._currentCallId is not None or self._lateCallId is not None
+
+	def _send(self, method: str, args: tuple):
+		self._currentCallId = self._nextCallId
+		self._currentMethod = method
+		self._nextCallId += 1
+		# the pilot process is only woken with the id of the call, if the observation fits into the buffer
+		if self.buffer and self.buffer.write_observation(self._currentCallId, *args):
+			args = None
+		self._connection.send((self._currentCallId, method, args))
+
+	def _miss_deadline(self):
+		"""
+		Gives up on the current call. Its answer is dropped when it arrives.
+		"""
+		if self._currentCallId is not None:
+			self._lateCallId = self._currentCallId
+			self._currentCallId = None
+		self.timeoutCount += 1
+
+	def _receive(self):
+		"""
+		:return: whether the answer belongs to the current call and its result
+		"""
+		call_id, status, result = self._connection.recv()
+		if call_id == self._lateCallId:
+			self._lateCallId = None
+		if call_id != self._currentCallId:
+			return False, None
+		self._currentCallId = None
+		if status == "error":
+			raise PilotCrashError(result)
+		if status == "buffer":
+			result = self.buffer.read_action(call_id, self._currentMethod)
+		return True, result
+
+	def _end(self) -> PilotCrashError:
+		self._hasEnded = True
+		self.process.join(1)
+		return PilotCrashError("The process of pilot \"" + self.pilotName + "\" ended with exit code " + str(self.process.exitcode) + ".")
+
+	def close(self):
+		self._hasEnded = True
+		self._connection.close()
+		if self.process.is_alive():
+			self.process.terminate()
+		self.process.join(1)
+		if self.buffer:
+			self.buffer.close(True)
+			self.buffer = None
+
+
+class PilotSandbox:
+
+	def __init__(self, deadline: float = 0.05, memory_limit: Optional[int] = 1024 * 1024 * 1024, start_timeout: float = 10, use_buffers: bool = True):
+		"""
+		Hosts each pilot in its own process, so that slow, looping or crashing pilots can't stall the game.
+		Pass it to GameHandler.pilotSandbox and close it after the match.
+		:param deadline: seconds each call of prepare_scan and update may take
+		:param memory_limit: bytes of address space each pilot process may use, not limited if None or on Windows
+		:param start_timeout: seconds a pilot process may take to start and create the pilot
+		:param use_buffers: whether to pass observations and actions through shared memory instead of pickling them
+		"""
+		self.deadline = deadline
+		self.memoryLimit = memory_limit
+		self.startTimeout = start_timeout
+		self.useBuffers = use_buffers
+		self.pilots: List[SandboxedPilot] = []
+
+	def create_pilot(self, pilot_class, seed: int) -> SandboxedPilot:
+		pilot = SandboxedPilot(pilot_class, seed, self.deadline, self.memoryLimit, self.startTimeout, self.useBuffers)
+		self.pilots.append(pilot)
+		return pilot
+
+	def start_calls(self, pilots: List[SandboxedPilot], method: str, args_list: List[tuple]) -> "PilotCalls":
+		return PilotCalls(pilots, method, args_list, self.deadline)
+
+	def close(self):
+		"""
+		Ends the processes of all pilots created so far.
+		"""
+		for pilot in self.pilots:
+			pilot.close()
+		self.pilots.clear()
+
+
+class PilotCalls:
+
+	def __init__(self, pilots: List[SandboxedPilot], method: str, args_list: List[tuple], deadline: Optional[float]):
+		"""
+		Calls the same method of several sandboxed pilots at once, so that they think in parallel.
+		Pilots still busy with a late call get their call as soon as they answered the late one.
+		:param args_list: arguments of the call for each pilot
+		:param deadline: seconds from now the pilots may take, unlimited if None
+		"""
+		self.pilots = pilots
+		self.method = method
+		self.end = time.perf_counter() + deadline if deadline is not None else None
+		self.futures = [Future() for _ in pilots]
+		# index of each pilot that did not answer yet by its connection
+		self._waiting = {}
+		self._unsent = {}
+		for i, (pilot, args) in enumerate(zip(pilots, args_list)):
+			if pilot._hasEnded:
+				self.futures[i].set_result(None)
+				continue
+			try:
+				if not pilot._is_busy():
+					pilot._send(method, args)
+				else:
+					self._unsent[i] = args
+			except OSError:
+				self.futures[i].set_exception(pilot._end())
+				continue
+			self._waiting[pilot._connection] = i
+
+	def is_done(self) -> bool:
+		"""
+		Receives the answers that already arrived without waiting for the others.
+		:return: whether all pilots answered
+		"""
+		self._receive(False)
+		return not self._waiting
+
+	def collect(self) -> List[Future]:
+		"""
+		Waits until all pilots answered or the deadline passed.
+		:return: one future per pilot with the result of its call, None if the pilot missed the deadline,
+		or a PilotCrashError if the pilot raised an exception or its process ended
+		"""
+		self._receive(True)
+		for i in self._waiting.values():
+			self.pilots[i]._miss_deadline()
+			self.futures[i].set_result(None)
+		self._waiting.clear()
+		return self.futures
+
+	def _receive(self, wait_for_deadline: bool):
+		while self._waiting:
+			timeout = 0.0
+			if wait_for_deadline:
+				timeout = max(0.0, self.end - time.perf_counter()) if self.end is not None else None
+			ready = wait(list(self._waiting), timeout)
+			if not ready:
+				return
+			for connection in ready:
+				i = self._waiting[connection]
+				pilot = self.pilots[i]
+				try:
+					is_answer, result = pilot._receive()
+					if not is_answer:
+						if i in self._unsent and not pilot._is_busy():
+							pilot._send(self.method, self._unsent.pop(i))
+						continue
+					self.futures[i].set_result(result)
+				except PilotCrashError as e:
+					self.futures[i].set_exception(e)
+				except (EOFError, OSError):
+					self.futures[i].set_exception(pilot._end())
+				del self._waiting[connection]
+
+
+def call_pilots(pilots: List[SandboxedPilot], method: str, args_list: List[tuple], deadline: Optional[float]) -> List[Future]:
+	"""
+	Calls the same method of several sandboxed pilots at once and waits until all of them answered or the deadline passed.
+	:return: see PilotCalls.collect
+	"""
+	return PilotCalls(pilots, method, args_list, deadline).collect()
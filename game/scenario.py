@@ -0,0 +1,148 @@
+import argparse
+import json
+import math
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from game.headlessMatch import HeadlessMatch
+from render.settings import fwSettings
+from util import fileLoad
+
+
+class ShipSetup:
+
+	def __init__(
+			self,
+			pilot: str,
+			position: Tuple[float, float],
+			heading: float = 0,
+			velocity: Tuple[float, float] = (0, 0),
+			health: Optional[float] = None,
+			energy: Optional[float] = None):
+		"""
+		Starting state of one spaceship of a scenario.
+		:param pilot: path of the pilot module
+		:param velocity: velocity in game units per game tick, like in the locations passed to pilots
+		:param health: starting health, full health if None
+		:param energy: starting energy, full energy if None
+		"""
+		self.pilot = pilot
+		self.position = position
+		self.heading = heading
+		self.velocity = velocity
+		self.health = health
+		self.energy = energy
+
+
+class RocketSetup:
+
+	def __init__(self, shooter: int, position: Tuple[float, float], heading: float):
+		"""
+		A rocket that is already flying at the start of a scenario.
+		:param shooter: index of the spaceship that shot the rocket
+		:param heading: angle the rocket flies towards
+		"""
+		self.shooter = shooter
+		self.position = position
+		self.heading = heading
+
+
+class Scenario:
+
+	def __init__(
+			self,
+			game_size: int,
+			ships: List[ShipSetup],
+			rockets: List[RocketSetup] = None,
+			seed: Optional[int] = None,
+			max_ticks: Optional[int] = None):
+		"""
+		Fixed starting positions of a match, e.g. for comparing the speed of the engine on identical inputs.
+		:param seed: seed for pilots and scans
+		"""
+		self.gameSize = game_size
+		self.ships = ships
+		self.rockets = rockets if rockets is not None else []
+		self.seed = seed
+		self.maxTicks = max_ticks
+
+	@staticmethod
+	def load(path: str) -> "Scenario":
+		"""
+		Loads a scenario from a JSON file, see scenarios/README.md for the format.
+		"""
+		with open(path) as file:
+			data = json.load(file)
+		try:
+			ships = [
+				ShipSetup(
+					ship["pilot"],
+					tuple(ship["position"]),
+					ship.get("heading", 0),
+					tuple(ship.get("velocity", (0, 0))),
+					ship.get("health"),
+					ship.get("energy"))
+				for ship in data["ships"]]
+			rockets = [RocketSetup(rocket["shooter"], tuple(rocket["position"]), rocket["heading"]) for rocket in data.get("rockets", [])]
+			return Scenario(data.get("gameSize", 100), ships, rockets, data.get("seed"), data.get("maxTicks"))
+		except (KeyError, TypeError) as e:
+			raise ValueError("Invalid scenario \"" + path + "\": " + repr(e))
+
+	def create_match(self, record_digests: bool = False, settings: Optional[fwSettings] = None) -> HeadlessMatch:
+		"""
+		Creates a headless match with the spaceships and rockets of the scenario.
+		:param settings: physics options of the match, the defaults if None
+		"""
+		match = HeadlessMatch(
+			[], self.gameSize, max_ticks=self.maxTicks, seed=self.seed,
+			record_digests=record_digests, settings=settings)
+		game_handler = match.gameHandler
+		ticks_per_second = match.ticksPerSecond
+
+		for ship in self.ships:
+			if ship.health is not None and ship.health <= 0:
+				raise ValueError("Spaceships of a scenario need health above 0.")
+			pilot = game_handler.create_pilot(fileLoad.load_class_by_module_name(ship.pilot))
+			match.place_spaceship(
+				pilot,
+				ship.position,
+				ship.heading,
+				(ship.velocity[0] * ticks_per_second, ship.velocity[1] * ticks_per_second),
+				ship.health if ship.health is not None else game_handler.spaceshipHealth,
+				ship.energy if ship.energy is not None else game_handler.spaceshipMaxEnergy)
+
+		for rocket in self.rockets:
+			if not 0 <= rocket.shooter < len(match.spaceships):
+				raise ValueError("Rocket shooter " + str(rocket.shooter) + " is not a spaceship of the scenario.")
+			velocity = (math.cos(rocket.heading) * game_handler.rocketSpeed, math.sin(rocket.heading) * game_handler.rocketSpeed)
+			match.place_rocket(match.spaceships[rocket.shooter], rocket.position, velocity)
+		return match
+
+
+def main(argv: List[str]):
+	parser = argparse.ArgumentParser(prog="spaceJam.py --scenario", description="Plays a scenario headless and measures the speed of the engine.")
+	parser.add_argument("--scenario", required=True, help="path of the scenario file")
+	parser.add_argument("--repeat", type=int, default=3, help="how often the scenario is played, the fastest run is reported")
+	parser.add_argument("--fast-physics", action="store_true", help="use fewer physics steps and solver iterations, see render/settings.py")
+	args = parser.parse_args(argv)
+
+	try:
+		scenario = Scenario.load(args.scenario)
+		settings = fwSettings(fastPhysics=args.fast_physics)
+		fastest = math.inf
+		for _ in range(args.repeat):
+			match = scenario.create_match(settings=settings)
+			start = time.perf_counter()
+			result = match.run()
+			fastest = min(fastest, time.perf_counter() - start)
+	except ValueError as e:
+		parser.error(str(e))
+
+	winner = result.winner if result.winner else "tie"
+	print(winner + " after " + str(result.ticks) + " ticks")
+	print("fastest run: %.3f s, %.0f steps/s" % (fastest, match.stepCount / fastest))
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,80 @@
+from typing import List
+
+import numpy as np
+
+from location import Location
+
+
+class ShipStates:
+
+	def __init__(self, capacity: int = 8):
+		"""
+		Stores the state of all spaceships of a match in contiguous arrays, indexed by the spaceship's index.
+		Health and energy are owned by this store, positions and velocities are copied from Box2D with sync().
+		"""
+		self.count = 0
+		self.spaceships: List = []
+		self.position = np.zeros((capacity, 2))
+		# velocity in game units per game tick, like in the locations passed to pilots
+		self.velocity = np.zeros((capacity, 2))
+		self.health = np.zeros(capacity)
+		self.maxHealth = np.zeros(capacity)
+		self.energy = np.zeros(capacity)
+		self.maxEnergy = np.zeros(capacity)
+
+	def clear(self):
+		self.count = 0
+		self.spaceships.clear()
+
+	def add(self, spaceship, max_health: float, max_energy: float) -> int:
+		"""
+		Adds a spaceship with full health and energy.
+		:return: index of the spaceship in the arrays
+		"""
+		if self.count == len(self.health):
+			self._grow(2 * self.count)
+		index = self.count
+		self.count += 1
+		self.spaceships.append(spaceship)
+		self.position[index] = 0
+		self.velocity[index] = 0
+		self.health[index] = self.maxHealth[index] = max_health
+		self.energy[index] = self.maxEnergy[index] = max_energy
+		return index
+
+	def _grow(self, capacity: int):
+		for name in ("position", "velocity", "health", "maxHealth", "energy", "maxEnergy"):
+			old = getattr(self, name)
+			new = np.zeros((capacity,) + old.shape[1:])
+			new[:len(old)] = old
+			setattr(self, name, new)
+
+	def alive_indices(self) -> np.ndarray:
+		return np.flatnonzero(self.health[:self.count] > 0)
+
+	def sync(self, indices: np.ndarray, ticks_per_second: int):
+		"""
+		Copies position and velocity of the given spaceships from their Box2D bodies.
+		"""
+		if len(indices) == 0:
+			return
+		values = []
+		for i in indices:
+			body = self.spaceships[i].body
+			pos = body.position
+			vel = body.linearVelocity
+			values.append((pos.x, pos.y, vel.x, vel.y))
+		values = np.array(values)
+		self.position[indices] = values[:, 0:2]
+		self.velocity[indices] = values[:, 2:4] / ticks_per_second
+
+	def create_locations(self, indices: np.ndarray) -> List[Location]:
+		"""
+		Creates one read-only location per given spaceship. All locations are views into one snapshot buffer
+		of the current tick, so pilots can keep them while the store changes.
+		"""
+		snapshot = np.empty((len(indices), 2, 2))
+		snapshot[:, 0] = self.position[indices]
+		snapshot[:, 1] = self.velocity[indices]
+		snapshot.flags.writeable = False
+		return [Location.create_view(snapshot[i, 0], snapshot[i, 1]) for i in range(len(indices))]
@@ -0,0 +1,183 @@
+import argparse
+import collections
+import itertools
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game.headlessMatch import HeadlessMatch, MatchResult
+from game.pilotSandbox import PilotSandbox
+from render.settings import fwSettings
+from util import fileLoad
+
+# pilot classes loaded by this (worker) process, by module path
+_loadedPilots = {}
+
+
+def load_pilot_class(module_path: str):
+	if module_path not in _loadedPilots:
+		_loadedPilots[module_path] = fileLoad.load_class_by_module_name(module_path)
+	return _loadedPilots[module_path]
+
+
+def create_lineups(pilot_paths: List[str], rounds: int = 1, free_for_all: bool = True) -> List[Tuple[str, ...]]:
+	"""
+	Creates every pairing of the given pilots and, if wanted, one line-up with all pilots at once.
+	Each line-up is repeated for the given number of rounds.
+	"""
+	lineups = list(itertools.combinations(pilot_paths, 2))
+	if free_for_all and len(pilot_paths) > 2:
+		lineups.append(tuple(pilot_paths))
+	return [lineup for lineup in lineups for _ in range(rounds)]
+
+
+def run_lineup(
+		lineup: Tuple[str, ...],
+		max_ticks: Optional[int] = None,
+		seed: Optional[int] = None,
+		settings: Optional[fwSettings] = None,
+		pilot_deadline: Optional[float] = None) -> MatchResult:
+	"""
+	Loads the pilots of a line-up and plays one headless match with them. Runs inside the worker processes.
+	"""
+	pilot_classes = [load_pilot_class(path) for path in lineup]
+	sandbox = PilotSandbox(pilot_deadline) if pilot_deadline is not None else None
+	try:
+		return HeadlessMatch(
+			pilot_classes, max_ticks=max_ticks, seed=seed, settings=settings,
+			pilot_sandbox=sandbox).run()
+	finally:
+		if sandbox:
+			sandbox.close()
+
+
+class Standing:
+
+	def __init__(self, name: str, path: str):
+		"""
+		:param name: class name of the pilot, also the name of its spaceships
+		:param path: path of the pilot module, pilots of different modules can have the same name
+		"""
+		self.name = name
+		self.path = path
+		self.wins = 0
+		self.ties = 0
+		self.losses = 0
+
+	def played(self) -> int:
+		return self.wins + self.ties + self.losses
+
+
+def find_winner(lineup: Tuple[str, ...], result: MatchResult) -> Optional[str]:
+	"""
+	:return: path of the pilot that won the match, None for a tie
+	"""
+	if result.is_tie():
+		return None
+	if len(result.ships) == len(lineup):
+		# ships are spawned in line-up order and only the winner has health left
+		for path, ship in zip(lineup, result.ships):
+			if ship.health > 0:
+				return path
+	# some pilots could not be created, so the ships can't be matched to the line-up
+	return next((path for path in lineup if load_pilot_class(path).__name__ == result.winner), None)
+
+
+def run_tournament(
+		pilot_paths: List[str],
+		workers: Optional[int] = None,
+		rounds: int = 1,
+		free_for_all: bool = True,
+		max_ticks: Optional[int] = None,
+		seed: Optional[int] = None,
+		result_callback: Callable[[Tuple[str, ...], MatchResult], None] = None,
+		settings: Optional[fwSettings] = None,
+		pilot_deadline: Optional[float] = None) -> Dict[str, Standing]:
+	"""
+	Plays all line-ups of a round-robin tournament on a pool of worker processes.
+	:param workers: number of worker processes, defaults to the number of CPUs
+	:param seed: if set, the n-th match is played with seed + n, so that the whole tournament can be repeated
+	:param result_callback: called in the main process with each line-up and its result as soon as the match finished
+	:param settings: physics options of every match, the defaults if None
+	:param pilot_deadline: if set, pilots run in their own processes and calls taking longer than this many seconds are skipped
+	:return: standings by pilot path
+	"""
+	names = {path: load_pilot_class(path).__name__ for path in pilot_paths}
+	standings = {path: Standing(names[path], path) for path in pilot_paths}
+	lineups = create_lineups(pilot_paths, rounds, free_for_all)
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = {}
+		for i, lineup in enumerate(lineups):
+			match_seed = seed + i if seed is not None else None
+			futures[executor.submit(run_lineup, lineup, max_ticks, match_seed, settings, pilot_deadline)] = lineup
+
+		for future in as_completed(futures):
+			lineup = futures[future]
+			try:
+				result = future.result()
+			except Exception:
+				print("Match " + " vs ".join(names[path] for path in lineup) + " failed:")
+				print(traceback.format_exc())
+				continue
+
+			winner = find_winner(lineup, result)
+			for path in lineup:
+				standing = standings[path]
+				if result.is_tie():
+					standing.ties += 1
+				elif path == winner:
+					standing.wins += 1
+				else:
+					standing.losses += 1
+			if result_callback:
+				result_callback(lineup, result)
+	return standings
+
+
+def main(argv: List[str]):
+	parser = argparse.ArgumentParser(prog="spaceJam.py --tournament", description="Plays a round-robin tournament of headless matches.")
+	parser.add_argument("--tournament", action="store_true", help=argparse.SUPPRESS)
+	parser.add_argument("pilots", nargs="+", help="paths of pilot modules, e.g. bots/orbiter.py")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+	parser.add_argument("--rounds", type=int, default=1, help="how often each line-up is played")
+	parser.add_argument("--max-ticks", type=int, default=None, help="game ticks after which a match ends as a tie")
+	parser.add_argument("--seed", type=int, default=None, help="seed of the first match, following matches use the next numbers")
+	parser.add_argument("--no-ffa", action="store_true", help="skip the free-for-all match with all pilots")
+	parser.add_argument("--sandbox-deadline", type=float, default=None, help="run each pilot in its own process and skip calls taking longer than this many seconds")
+	parser.add_argument("--fast-physics", action="store_true", help="use fewer physics steps and solver iterations, see render/settings.py")
+	args = parser.parse_args(argv)
+
+	match_count = len(create_lineups(args.pilots, args.rounds, not args.no_ffa))
+	finished = 0
+
+	def print_result(lineup: Tuple[str, ...], result: MatchResult):
+		nonlocal finished
+		finished += 1
+		winner = result.winner if result.winner else "tie"
+		names = " vs ".join(ship.name for ship in result.ships)
+		print("[" + str(finished) + "/" + str(match_count) + "] " + names + " -> " + winner + " (" + str(result.ticks) + " ticks, seed " + str(result.seed) + ", " + str(result.contactCallbacks) + " contact callbacks)", flush=True)
+		for ship in result.ships:
+			if ship.timeouts or ship.crashes:
+				print("    " + ship.name + ": " + str(ship.timeouts) + " timeouts, " + str(ship.crashes) + " crashes", flush=True)
+
+	try:
+		standings = run_tournament(args.pilots, args.workers, args.rounds, not args.no_ffa, args.max_ticks, args.seed, print_result,
+			fwSettings(fastPhysics=args.fast_physics), args.sandbox_deadline)
+	except ValueError as e:
+		parser.error(str(e))
+
+	print()
+	name_counts = collections.Counter(standing.name for standing in standings.values())
+	# pilots with the same name are told apart by their path
+	names = {path: standing.name if name_counts[standing.name] == 1 else standing.name + " (" + path + ")" for path, standing in standings.items()}
+	width = max(20, max(len(name) for name in names.values()))
+	print("%-*s %6s %6s %6s %6s" % (width, "pilot", "played", "wins", "ties", "losses"))
+	for path, standing in sorted(standings.items(), key=lambda item: (item[1].wins, item[1].ties), reverse=True):
+		print("%-*s %6d %6d %6d %6d" % (width, names[path], standing.played(), standing.wins, standing.ties, standing.losses))
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,149 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+
+from game.headlessMatch import HeadlessMatch
+from spaceshipPilot import SpaceshipPilot
+
+# columns of the observation of each spaceship
+OBSERVATION_COLUMNS = ("x", "y", "velocity x", "velocity y", "health", "energy")
+
+
+class TrainingAgent(SpaceshipPilot):
+
+	def __init__(self):
+		"""
+		Placeholder pilot of the spaceship controlled by TrainingEnv. Its actions come from the action batch.
+		"""
+		super().__init__("#FFD700")
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		return None
+
+
+class TrainingEnv:
+
+	def __init__(
+			self,
+			env_count: int,
+			opponent_classes: List,
+			game_size: int = 100,
+			ticks_per_second: int = 5,
+			hz: int = 60,
+			max_ticks: Optional[int] = 500,
+			seed: Optional[int] = None):
+		"""
+		Runs several independent arenas in one process, each with one trained spaceship against the opponent pilots.
+		Every step() plays one game tick in all arenas. Arenas whose match ended are reset automatically.
+		Observations: (env_count, spaceship_count, 6) array with the OBSERVATION_COLUMNS of every spaceship
+		at the moment pilots are updated. The trained spaceship is row 0, dead spaceships are all zeros.
+		The trained spaceship sees all spaceships without scanning.
+		Actions: (env_count, 3) array with the acceleration and the shoot angle (NaN for not shooting).
+		Rewards: health the opponents lost minus the health the trained spaceship lost during the tick,
+		plus 100 for winning and minus 100 for losing the match.
+		:param opponent_classes: pilot classes of the other spaceships in every arena
+		:param max_ticks: ticks after which a match is ended as a tie
+		:param seed: seed of the first match, later matches use the following seeds
+		"""
+		self.envCount = env_count
+		self.opponentClasses = opponent_classes
+		self.gameSize = game_size
+		self.ticksPerSecond = ticks_per_second
+		self.hz = hz
+		self.maxTicks = max_ticks
+		self.nextSeed = seed if seed is not None else random.getrandbits(32)
+
+		spaceship_count = 1 + len(opponent_classes)
+		self.observations = np.zeros((env_count, spaceship_count, len(OBSERVATION_COLUMNS)))
+		self.rewards = np.zeros(env_count)
+		self.dones = np.zeros(env_count, dtype=bool)
+		self.matches: List[Optional[HeadlessMatch]] = [None] * env_count
+		# indices of the spaceships alive in the current tick of each arena
+		self._alive: List[np.ndarray] = [np.zeros(0, dtype=int)] * env_count
+		self._healths = np.zeros((env_count, spaceship_count))
+
+	def reset(self) -> np.ndarray:
+		"""
+		Starts new matches in all arenas.
+		:return: observations of the first tick
+		"""
+		for i in range(self.envCount):
+			self._reset_arena(i)
+		return self.observations
+
+	def step(self, actions: np.ndarray):
+		"""
+		Applies the actions of the trained spaceships and plays one game tick in all arenas.
+		:param actions: (env_count, 3) array of acceleration x, acceleration y and shoot angle
+		:return: observations, rewards and which matches ended. Observations of ended matches are from the new match.
+		"""
+		self.rewards[:] = 0
+		self.dones[:] = False
+		for i, match in enumerate(self.matches):
+			game_handler = match.gameHandler
+			game_handler.externalAccelerations[0] = actions[i, 0:2]
+			game_handler.externalShootAngles[0] = actions[i, 2]
+			game_handler.finish_tick(self._alive[i])
+			match.contactHandler.end_step()
+			self._advance_to_tick(i)
+
+			healths = match.gameHandler.shipStates.health[:match.gameHandler.shipStates.count]
+			losses = self._healths[i, :len(healths)] - healths
+			self.rewards[i] = np.sum(losses[1:]) - losses[0]
+			if self._is_over(match):
+				self.dones[i] = True
+				if healths[0] <= 0:
+					self.rewards[i] -= 100
+				elif len(match.contactHandler.spaceships) == 1:
+					self.rewards[i] += 100
+				self._reset_arena(i)
+			else:
+				self._observe(i)
+		return self.observations, self.rewards, self.dones
+
+	def _reset_arena(self, index: int):
+		match = HeadlessMatch(
+			[TrainingAgent] + self.opponentClasses,
+			self.gameSize,
+			self.ticksPerSecond,
+			self.hz,
+			max_ticks=self.maxTicks,
+			seed=self.nextSeed)
+		self.nextSeed += 1
+		game_handler = match.gameHandler
+		game_handler.externalSpaceships = [match.spaceships[0]]
+		game_handler.externalAccelerations = np.zeros((1, 2))
+		game_handler.externalShootAngles = np.full(1, np.nan)
+		self.matches[index] = match
+		self._advance_to_tick(index)
+		self._observe(index)
+
+	def _advance_to_tick(self, index: int):
+		"""
+		Steps the physics of an arena up to its next game tick and runs the first half of the tick.
+		"""
+		match = self.matches[index]
+		match.step_world()
+		while not match.is_tick_step():
+			match.contactHandler.end_step()
+			match.step_world()
+		self._alive[index] = match.gameHandler.begin_tick()
+
+	def _is_over(self, match: HeadlessMatch) -> bool:
+		return match.is_over() or match.spaceships[0] not in match.contactHandler.spaceships
+
+	def _observe(self, index: int):
+		states = self.matches[index].gameHandler.shipStates
+		count = states.count
+		observation = self.observations[index]
+		observation[:] = 0
+		alive = self._alive[index]
+		observation[alive, 0:2] = states.position[alive]
+		observation[alive, 2:4] = states.velocity[alive]
+		observation[alive, 4] = states.health[alive]
+		observation[alive, 5] = states.energy[alive]
+		self._healths[index, :count] = states.health[:count]
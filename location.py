@@ -5,13 +5,26 @@ def wrap_to_pi(rad_angle):
 	return (rad_angle + math.pi) % (2 * math.pi) - math.pi
 
 class Location:
+	__slots__ = ("_position", "_velocity")
 
 	def __init__(self, position: np.ndarray = np.zeros(2), velocity: np.ndarray = np.zeros(2)):
 		"""
-		Represents the position and velocity of a spaceship.
+		Represents the position and velocity of a spaceship. The vectors of a location are read-only.
 		"""
 		self._position = position.copy()
 		self._velocity = velocity.copy()
+		self._position.flags.writeable = False
+		self._velocity.flags.writeable = False
+
+	@staticmethod
+	def create_view(position: np.ndarray, velocity: np.ndarray) -> "Location":
+		"""
+		Creates a location that uses the given read-only arrays instead of copying them.
+		"""
+		location = Location.__new__(Location)
+		location._position = position
+		location._velocity = velocity
+		return location
 
 	def get_position(self) -> np.ndarray:
 		"""
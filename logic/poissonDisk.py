@@ -0,0 +1,73 @@
+import math
+import random
+from typing import List, Tuple
+
+
+def sample_poisson_disk(
+		lower: float,
+		upper: float,
+		min_distance: float,
+		count: int,
+		rnd: random.Random,
+		tries: int = 30) -> List[Tuple[float, float]]:
+	"""
+	Picks random points inside a square that are at least min_distance apart from each other.
+	The square is filled with Bridson's algorithm, then count of the points are picked, so that they spread over the whole square.
+	:param lower: lower x and y coordinate of the square
+	:param upper: upper x and y coordinate of the square
+	:param count: number of points to pick at most
+	:param rnd: random generator to pick the points with
+	:param tries: number of candidates around a point before it is not used for finding new points anymore
+	:return: the points, fewer than count if the square is full
+	"""
+	size = upper - lower
+	if count <= 0 or size < 0:
+		return []
+	# each cell can contain at most one point
+	cell_size = min_distance / math.sqrt(2)
+	cells_per_row = max(1, int(math.ceil(size / cell_size)))
+	grid = [-1] * (cells_per_row * cells_per_row)
+	points = []
+	active = []
+
+	def to_cell(x: float, y: float) -> Tuple[int, int]:
+		return (
+			min(cells_per_row - 1, int((x - lower) / cell_size)),
+			min(cells_per_row - 1, int((y - lower) / cell_size)))
+
+	def is_free(x: float, y: float) -> bool:
+		cell_x, cell_y = to_cell(x, y)
+		for neighbor_y in range(max(0, cell_y - 2), min(cells_per_row, cell_y + 3)):
+			for neighbor_x in range(max(0, cell_x - 2), min(cells_per_row, cell_x + 3)):
+				index = grid[neighbor_y * cells_per_row + neighbor_x]
+				if index >= 0:
+					other_x, other_y = points[index]
+					if (other_x - x) ** 2 + (other_y - y) ** 2 < min_distance * min_distance:
+						return False
+		return True
+
+	def add_point(x: float, y: float):
+		cell_x, cell_y = to_cell(x, y)
+		grid[cell_y * cells_per_row + cell_x] = len(points)
+		active.append(len(points))
+		points.append((x, y))
+
+	add_point(rnd.uniform(lower, upper), rnd.uniform(lower, upper))
+	while active:
+		active_index = rnd.randrange(len(active))
+		center_x, center_y = points[active[active_index]]
+
+		for _ in range(tries):
+			angle = rnd.uniform(-math.pi, math.pi)
+			distance = rnd.uniform(min_distance, 2 * min_distance)
+			x = center_x + math.cos(angle) * distance
+			y = center_y + math.sin(angle) * distance
+			if lower <= x <= upper and lower <= y <= upper and is_free(x, y):
+				add_point(x, y)
+				break
+		else:
+			active[active_index] = active[-1]
+			active.pop()
+	if len(points) > count:
+		return rnd.sample(points, count)
+	return points
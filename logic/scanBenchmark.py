@@ -0,0 +1,55 @@
+import math
+import time
+
+import numpy as np
+
+from logic import scanning
+from logic.spatialGrid import SpatialGrid
+
+
+def create_scans(rnd: np.random.Generator, ship_count: int):
+	return (
+		list(range(ship_count)),
+		rnd.uniform(-math.pi, math.pi, ship_count).tolist(),
+		rnd.uniform(10, 50, ship_count).tolist(),
+		rnd.uniform(math.pi / 8, math.pi / 2, ship_count).tolist())
+
+
+def measure(function, repetitions: int) -> float:
+	start = time.perf_counter()
+	for _ in range(repetitions):
+		function()
+	return (time.perf_counter() - start) / repetitions
+
+
+def run_benchmark(ship_counts, repetitions: int = 5, seed: int = 0):
+	"""
+	Compares brute force and grid scans with every spaceship scanning once per tick.
+	The game field grows with the number of spaceships, so that the density stays the same as with 8 spaceships.
+	"""
+	rnd = np.random.default_rng(seed)
+	print("%6s %8s %12s %12s %8s" % ("ships", "size", "brute ms", "grid ms", "speedup"))
+
+	for ship_count in ship_counts:
+		size = 100 * math.sqrt(ship_count / 8)
+		positions = rnd.uniform(0, size, (ship_count, 2))
+		scans = create_scans(rnd, ship_count)
+		grid = SpatialGrid(size, 10)
+
+		def scan_grid():
+			grid.rebuild(positions)
+			return scanning.calc_located_spaceships_grid(grid, positions, *scans)
+
+		def scan_brute_force():
+			return scanning.calc_located_spaceships_batch(positions, *scans)
+
+		if scan_grid() != scan_brute_force():
+			raise AssertionError("Grid and brute force scans differ for " + str(ship_count) + " spaceships.")
+
+		brute_time = measure(scan_brute_force, repetitions)
+		grid_time = measure(scan_grid, repetitions)
+		print("%6d %8.0f %12.3f %12.3f %7.1fx" % (ship_count, size, brute_time * 1000, grid_time * 1000, brute_time / grid_time))
+
+
+if __name__ == '__main__':
+	run_benchmark([8, 32, 128, 500, 1000, 2000])
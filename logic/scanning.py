@@ -4,6 +4,7 @@ from typing import List
 import numpy as np
 
 from location import Location
+from logic.spatialGrid import SpatialGrid
 
 EPSILON = 0.0001
 
@@ -28,3 +29,102 @@ def is_loc_in_scan(loc: Location, scan_center: Location, direction: float, radiu
 	angle_towards_loc = math.atan2(dist_vec[1], dist_vec[0])
 	rel_angle = wrap_to_pi(angle_towards_loc - direction)
 	return abs(rel_angle) - angle / 2 <= EPSILON
+
+
+def calc_scan_offsets(positions: np.ndarray, scanner_indices: np.ndarray):
+	"""
+	Calculates offsets, distances and angles from every scanning spaceship to every spaceship at once.
+	:param positions: (n, 2) array with the position of every spaceship
+	:param scanner_indices: indices of the scanning spaceships
+	:return: (s, n, 2) offsets, (s, n) distances and (s, n) angles from each scanner towards each spaceship
+	"""
+	offsets = positions[np.newaxis, :, :] - positions[scanner_indices][:, np.newaxis, :]
+	distances = np.sqrt(offsets[:, :, 0] * offsets[:, :, 0] + offsets[:, :, 1] * offsets[:, :, 1])
+	angles = np.arctan2(offsets[:, :, 1], offsets[:, :, 0])
+	return offsets, distances, angles
+
+
+def calc_located_spaceships_batch(
+		positions: np.ndarray,
+		scanner_indices: List[int],
+		directions: List[float],
+		distances: List[float],
+		angles: List[float]) -> List[List[int]]:
+	"""
+	Resolves the scans of all spaceships of a game tick with the same rules as is_loc_in_scan.
+	:param positions: (n, 2) array with the position of every spaceship
+	:param scanner_indices: index of the scanning spaceship for each scan
+	:return: for each scan the indices of the located spaceships in ascending order, without the scanner itself
+	"""
+	if len(scanner_indices) == 0:
+		return []
+	scanner_indices = np.asarray(scanner_indices, dtype=int)
+	_, target_distances, target_angles = calc_scan_offsets(positions, scanner_indices)
+
+	radii = np.asarray(distances, dtype=float)[:, np.newaxis]
+	rel_angles = wrap_to_pi(target_angles - np.asarray(directions, dtype=float)[:, np.newaxis])
+	is_located = np.abs(rel_angles) - np.asarray(angles, dtype=float)[:, np.newaxis] / 2 <= EPSILON
+	is_located &= ~(target_distances > radii)
+	is_located[np.arange(len(scanner_indices)), scanner_indices] = False
+	return [np.flatnonzero(row).tolist() for row in is_located]
+
+
+def calc_scan_bounds(centers: np.ndarray, directions: np.ndarray, distances: np.ndarray, angles: np.ndarray):
+	"""
+	Calculates the axis aligned bounding boxes of scanned circle segments, widened by EPSILON like is_loc_in_scan.
+	:param centers: (s, 2) array of scan centers
+	:return: (s, 2) arrays of lower and upper box corners
+	"""
+	half_angles = angles / 2 + EPSILON
+	corner_angles = [directions - half_angles, directions + half_angles]
+	point_x = [np.zeros(len(centers))] + [np.cos(a) for a in corner_angles]
+	point_y = [np.zeros(len(centers))] + [np.sin(a) for a in corner_angles]
+
+	# a segment reaches further than its corners where it crosses one of the axes
+	for axis_angle, axis_x, axis_y in ((0, 1, 0), (math.pi / 2, 0, 1), (math.pi, -1, 0), (-math.pi / 2, 0, -1)):
+		crosses_axis = np.abs(wrap_to_pi(axis_angle - directions)) <= half_angles
+		point_x.append(np.where(crosses_axis, axis_x, 0))
+		point_y.append(np.where(crosses_axis, axis_y, 0))
+
+	point_x = np.array(point_x) * distances
+	point_y = np.array(point_y) * distances
+	# margin against rounding errors of the corner points
+	margin = 1e-9 * (1 + np.abs(distances))
+	lower = centers + np.stack([point_x.min(axis=0), point_y.min(axis=0)], axis=1) - margin[:, np.newaxis]
+	upper = centers + np.stack([point_x.max(axis=0), point_y.max(axis=0)], axis=1) + margin[:, np.newaxis]
+	return lower, upper
+
+
+def calc_located_spaceships_grid(
+		grid: SpatialGrid,
+		positions: np.ndarray,
+		scanner_indices: List[int],
+		directions: List[float],
+		distances: List[float],
+		angles: List[float]) -> List[List[int]]:
+	"""
+	Same as calc_located_spaceships_batch, but only tests the spaceships in grid cells overlapping each scan.
+	:param grid: grid already rebuilt with the given positions
+	"""
+	if len(scanner_indices) == 0:
+		return []
+	scanner_indices = np.asarray(scanner_indices, dtype=int)
+	directions = np.asarray(directions, dtype=float)
+	distances = np.asarray(distances, dtype=float)
+	angles = np.asarray(angles, dtype=float)
+
+	centers = positions[scanner_indices]
+	scans, candidates = grid.query_boxes(*calc_scan_bounds(centers, directions, distances, angles))
+
+	offsets = positions[candidates] - centers[scans]
+	candidate_distances = np.sqrt(offsets[:, 0] * offsets[:, 0] + offsets[:, 1] * offsets[:, 1])
+	rel_angles = wrap_to_pi(np.arctan2(offsets[:, 1], offsets[:, 0]) - directions[scans])
+	is_located = np.abs(rel_angles) - angles[scans] / 2 <= EPSILON
+	is_located &= ~(candidate_distances > distances[scans])
+	is_located &= candidates != scanner_indices[scans]
+
+	scans = scans[is_located]
+	candidates = candidates[is_located]
+	order = np.lexsort((candidates, scans))
+	split_points = np.cumsum(np.bincount(scans, minlength=len(scanner_indices)))[:-1]
+	return [located.tolist() for located in np.split(candidates[order], split_points)]
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+
+
+class SpatialGrid:
+
+	def __init__(self, size: float, cell_size: float):
+		"""
+		Uniform grid over a square game field that sorts points by cell, so that all points inside a box can be found
+		without looking at every point. Points outside of the field are counted to the closest border cell.
+		:param size: width and height of the game field
+		:param cell_size: width and height of one grid cell
+		"""
+		self.size = size
+		self.cellSize = cell_size
+		self.cellsPerRow = max(1, int(math.ceil(size / cell_size)))
+		self._order = np.zeros(0, dtype=int)
+		self._cellStarts = np.zeros(self.cellsPerRow * self.cellsPerRow + 1, dtype=int)
+
+	def rebuild(self, positions: np.ndarray):
+		"""
+		Sorts the given points into the grid. Call this once per game tick before querying.
+		:param positions: (n, 2) array of points
+		"""
+		cells = self._to_cells(positions)
+		cell_ids = cells[:, 1] * self.cellsPerRow + cells[:, 0]
+		self._order = np.argsort(cell_ids, kind="stable")
+		counts = np.bincount(cell_ids, minlength=self.cellsPerRow * self.cellsPerRow)
+		self._cellStarts[0] = 0
+		np.cumsum(counts, out=self._cellStarts[1:])
+
+	def query_box(self, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Returns the indices of all points in the cells overlapping the box. This can include points outside the box.
+		"""
+		return self.query_boxes(np.array([lower]), np.array([upper]))[1]
+
+	def query_boxes(self, lowers: np.ndarray, uppers: np.ndarray):
+		"""
+		Finds the points in the cells overlapping each of the given boxes at once.
+		:param lowers: (s, 2) array of lower box corners
+		:param uppers: (s, 2) array of upper box corners
+		:return: box index and point index of each found point, sorted by box
+		"""
+		lower_cells = self._to_cells(lowers)
+		upper_cells = self._to_cells(uppers)
+		row_counts = np.maximum(0, upper_cells[:, 1] - lower_cells[:, 1] + 1)
+
+		# cells of one row are stored next to each other, so each box needs one slice of points per row
+		row_boxes = np.repeat(np.arange(len(lowers)), row_counts)
+		row_firsts = np.cumsum(row_counts) - row_counts
+		rows = lower_cells[row_boxes, 1] + np.arange(len(row_boxes)) - row_firsts[row_boxes]
+		slice_starts = self._cellStarts[rows * self.cellsPerRow + lower_cells[row_boxes, 0]]
+		slice_ends = self._cellStarts[rows * self.cellsPerRow + upper_cells[row_boxes, 0] + 1]
+		slice_lengths = np.maximum(0, slice_ends - slice_starts)
+
+		point_slices = np.repeat(np.arange(len(row_boxes)), slice_lengths)
+		slice_firsts = np.cumsum(slice_lengths) - slice_lengths
+		sorted_indices = slice_starts[point_slices] + np.arange(len(point_slices)) - slice_firsts[point_slices]
+		return row_boxes[point_slices], self._order[sorted_indices]
+
+	def _to_cells(self, positions: np.ndarray) -> np.ndarray:
+		cells = np.floor(positions / self.cellSize).astype(int)
+		return np.clip(cells, 0, self.cellsPerRow - 1)
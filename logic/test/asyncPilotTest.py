@@ -0,0 +1,90 @@
+import asyncio
+import time
+import unittest
+
+from bots.creeper import Creeper
+from game.headlessMatch import HeadlessMatch
+from pilotAction import PilotAction
+from render.settings import fwSettings
+from spaceshipPilot import AsyncSpaceshipPilot
+
+
+class WaitingPilot(AsyncSpaceshipPilot):
+
+	async def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		await asyncio.sleep(0.05)
+		return None
+
+	async def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		await asyncio.sleep(0.05)
+		return None
+
+
+class LatePilot(AsyncSpaceshipPilot):
+
+	async def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	async def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		if game_tick > 0:
+			await asyncio.sleep(10)
+		action = PilotAction()
+		action.move_spaceship_with_vec([0.1, 0])
+		return action
+
+
+class StoredWaitPilot(AsyncSpaceshipPilot):
+	wait = None
+
+	async def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	async def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		# the stored future is cancelled with the late call of the first tick
+		if self.wait is None:
+			self.wait = asyncio.ensure_future(asyncio.sleep(1))
+		await self.wait
+		return None
+
+
+class CrashingPilot(AsyncSpaceshipPilot):
+
+	async def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		raise RuntimeError("crash")
+
+	async def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		return None
+
+
+class AsyncPilotTest(unittest.TestCase):
+
+	def test_pilots_wait_at_once(self):
+		match = HeadlessMatch([WaitingPilot] * 4, seed=1, max_ticks=5, settings=fwSettings(pilotDeadline=5))
+		start = time.perf_counter()
+		result = match.run()
+		# one after another, the pilots would take 4 * 2 * 0.05 s per tick
+		self.assertLess(time.perf_counter() - start, 5 * 0.4 * 0.75)
+		self.assertEqual([0, 0, 0, 0], [ship.timeouts for ship in result.ships])
+
+	def test_late_pilot_repeats_last_action(self):
+		match = HeadlessMatch([LatePilot, Creeper], seed=1, max_ticks=4, settings=fwSettings(pilotDeadline=0.02))
+		start = time.perf_counter()
+		result = match.run()
+		self.assertLess(time.perf_counter() - start, 5)
+		self.assertEqual(3, result.ships[0].timeouts)
+		# the move of the first tick was also paid in the last tick
+		self.assertIsNotNone(match.spaceships[0].pilot.lastAction)
+		self.assertAlmostEqual(match.gameHandler.spaceshipMaxEnergy - 0.1 * match.gameHandler.moveCostFactor, result.ships[0].energy)
+
+	def test_cancelled_pilot_counts_as_timeout(self):
+		result = HeadlessMatch([StoredWaitPilot, Creeper], seed=1, max_ticks=4, settings=fwSettings(pilotDeadline=0.02)).run()
+		self.assertEqual(4, result.ships[0].timeouts)
+		self.assertEqual(0, result.ships[0].crashes)
+
+	def test_crashes_are_counted(self):
+		result = HeadlessMatch([CrashingPilot, Creeper], seed=1, max_ticks=10).run()
+		self.assertEqual(10, result.ships[0].crashes)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+import unittest
+
+from bots.batman import Batman
+from bots.creeper import Creeper
+from bots.explorer import Explorer
+from bots.orbiter import Orbiter
+from game.headlessMatch import HeadlessMatch
+from spaceshipPilot import SpaceshipPilot
+from util import fileLoad
+
+# restores a checkpoint read from stdin and prints the result of the match
+RESTORE_MATCH = """
+import sys
+from game.headlessMatch import HeadlessMatch
+from spaceshipPilot import SpaceshipPilot
+result = HeadlessMatch.restore(sys.stdin.buffer.read()).run()
+print(result.winner, result.ticks, result.digests[-1])
+"""
+
+
+class CrashingPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		raise RuntimeError("crash")
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		return None
+
+
+def step_to_checkpoint(match: HeadlessMatch, steps: int):
+	"""
+	Steps the match at least steps times and on until no contacts are open, as Box2D can't restore its contact cache.
+	"""
+	for _ in range(steps):
+		match.step()
+	while match.world.contactCount and not match.is_over():
+		match.step()
+
+
+class CheckpointTest(unittest.TestCase):
+
+	def test_restored_match_continues_like_the_original(self):
+		for seed in range(4):
+			match = HeadlessMatch([Orbiter, Creeper, Explorer, Batman], seed=seed, record_digests=True)
+			# also between two game ticks
+			step_to_checkpoint(match, 301 + 5 * seed)
+			self.assertFalse(match.is_over())
+			checkpoint = match.checkpoint()
+
+			restored = HeadlessMatch.restore(checkpoint)
+			self.assertEqual(match.stepCount, restored.stepCount)
+			restored_result = restored.run()
+			result = match.run()
+			self.assertEqual(result.digests, restored_result.digests)
+			self.assertEqual(result.winner, restored_result.winner)
+			self.assertEqual(result.ticks, restored_result.ticks)
+
+	def test_forks_play_out_the_same_way(self):
+		match = HeadlessMatch([Orbiter, Creeper, Batman], seed=2, record_digests=True)
+		step_to_checkpoint(match, 120)
+		first = match.fork().run()
+		second = match.fork().run()
+		self.assertEqual(first.digests, second.digests)
+		self.assertGreater(len(first.digests), match.gameHandler.gameTick)
+
+	def test_crashes_are_restored(self):
+		match = HeadlessMatch([CrashingPilot, Orbiter], seed=1, max_ticks=10)
+		step_to_checkpoint(match, 60)
+		restored = HeadlessMatch.restore(match.checkpoint())
+		self.assertEqual(match.spaceships[0].crashCount, restored.spaceships[0].crashCount)
+		self.assertEqual(10, restored.run().ships[0].crashes)
+
+	def test_loaded_pilots_are_restored_in_a_new_process(self):
+		pilot_classes = [fileLoad.load_class_by_module_name(path) for path in ["bots/orbiter.py", "bots/creeper.py"]]
+		match = HeadlessMatch(pilot_classes, seed=1, record_digests=True)
+		step_to_checkpoint(match, 120)
+		checkpoint = match.checkpoint()
+		output = subprocess.run([sys.executable, "-c", RESTORE_MATCH], input=checkpoint, capture_output=True, check=True).stdout
+		result = HeadlessMatch.restore(checkpoint).run()
+		self.assertEqual(" ".join([str(result.winner), str(result.ticks), result.digests[-1]]), output.decode().strip())
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,135 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from bots.orbiter import Orbiter
+from game.boxExplosion import BoxExplosion
+from game.boxScan import BoxScan
+from game.headlessMatch import HeadlessMatch
+
+
+class ContactListenerTest(unittest.TestCase):
+
+	def setUp(self):
+		self.match = HeadlessMatch([], game_size=100, seed=1)
+		self.contactHandler = self.match.contactHandler
+
+	def place_ship(self, position, velocity=(0, 0), health=100):
+		return self.match.place_spaceship(Orbiter(), position, 0, velocity, health, 100)
+
+	def step_world(self):
+		"""
+		Steps the world without applying the recorded contacts.
+		:return: the recorded contacts as (rocket id, other id)
+		"""
+		self.match.world.Step(1.0 / self.match.hz, self.match.velocityIterations, self.match.positionIterations)
+		return [tuple(contact) for contact in self.contactHandler._contacts[:self.contactHandler._contactCount].tolist()]
+
+	def finish_step(self):
+		self.contactHandler.after_world_step()
+		self.contactHandler.end_step()
+
+	def step_until_contact(self, max_steps: int = 60):
+		for _ in range(max_steps):
+			contacts = self.step_world()
+			if contacts:
+				return contacts
+			self.finish_step()
+		self.fail("No contact within " + str(max_steps) + " steps.")
+
+	def test_rocket_hits_spaceship(self):
+		shooter = self.place_ship((30, 50))
+		target = self.place_ship((50, 50))
+		self.match.place_rocket(shooter, (40, 50), (60, 0))
+		rocket = next(iter(self.contactHandler.rockets))
+
+		contacts = self.step_until_contact()
+		self.assertEqual([(rocket.contactId, target.contactId)], contacts)
+		self.finish_step()
+		self.assertEqual(80, target.health)
+		self.assertEqual(100, shooter.health)
+		self.assertEqual(0, len(self.contactHandler.rockets))
+		self.assertEqual(1, len(self.contactHandler.explosions))
+
+	def test_spaceships_hitting_each_other_take_no_damage(self):
+		first = self.place_ship((45, 50), (20, 0))
+		second = self.place_ship((55, 50), (-20, 0))
+		for _ in range(60):
+			self.assertEqual([], self.step_world())
+			self.finish_step()
+		self.assertGreater(self.contactHandler.contactCallbackCount, 0)
+		self.assertEqual((100, 100), (first.health, second.health))
+		self.assertEqual(0, len(self.contactHandler.explosions))
+
+	def test_rocket_hits_border(self):
+		shooter = self.place_ship((50, 50))
+		self.match.place_rocket(shooter, (90, 50), (60, 0))
+		rocket = next(iter(self.contactHandler.rockets))
+
+		# the border has no contact id
+		self.assertEqual([(rocket.contactId, -1)], self.step_until_contact())
+		self.finish_step()
+		self.assertEqual(100, shooter.health)
+		self.assertEqual(0, len(self.contactHandler.rockets))
+		self.assertEqual(1, len(self.contactHandler.explosions))
+
+	def test_rockets_of_one_step_do_not_hit_a_destroyed_spaceship_again(self):
+		shooter = self.place_ship((30, 50))
+		target = self.place_ship((50, 50), health=20)
+		self.match.place_rocket(shooter, (45, 51), (60, 0))
+		self.match.place_rocket(shooter, (45, 49), (60, 0))
+
+		self.assertEqual(2, len(self.step_until_contact()))
+		self.finish_step()
+		self.assertEqual(0, target.health)
+		self.assertNotIn(target, self.contactHandler.spaceships)
+		self.assertEqual(0, len(self.contactHandler.rockets))
+		# one explosion per rocket and one of the spaceship
+		self.assertEqual(3, len(self.contactHandler.explosions))
+
+	def test_reset_removes_rockets_in_flight(self):
+		border_bodies = self.match.startWorldCounts[0]
+		shooter = self.place_ship((30, 50))
+		self.place_ship((70, 50))
+		self.match.place_rocket(shooter, (40, 50), (60, 0))
+		self.match.place_rocket(shooter, (40, 60), (60, 0))
+		self.step_world()
+		self.finish_step()
+		self.assertEqual(2, len(self.contactHandler.rockets))
+
+		self.contactHandler.reset()
+		self.assertEqual(0, len(self.contactHandler.rockets))
+		self.assertEqual(border_bodies, self.match.world.bodyCount)
+
+	def test_start_match_warns_about_leaked_bodies(self):
+		self.place_ship((30, 50))
+		self.contactHandler.reset()
+		with redirect_stdout(io.StringIO()) as output:
+			self.contactHandler.start_match()
+		self.assertEqual("", output.getvalue())
+
+		# a body that is not known to the contact handler survives the reset
+		self.match.world.CreateDynamicBody(position=(50, 50))
+		self.contactHandler.reset()
+		with redirect_stdout(io.StringIO()) as output:
+			self.contactHandler.start_match()
+		self.assertIn("1 more than at the start of the last match", output.getvalue())
+
+	def test_effects_expire_after_their_duration(self):
+		for _ in range(3):
+			self.contactHandler.end_step()
+		start = self.contactHandler.stepCount
+		scan = BoxScan((50, 50), 0, 20, 1, start_step=start, duration=4)
+		explosion = BoxExplosion((50, 50), 3, start_step=start, duration=7)
+		self.contactHandler.add_scan(scan)
+		self.contactHandler.add_explosion(explosion)
+
+		for step in range(1, 8):
+			self.contactHandler.end_step()
+			self.assertEqual(step < 4, scan in self.contactHandler.scans)
+			self.assertEqual(step < 7, explosion in self.contactHandler.explosions)
+		self.assertEqual(start + 7, self.contactHandler.stepCount)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,85 @@
+import math
+import unittest
+
+import numpy as np
+from Box2D import b2World
+
+import forwardModel
+from game.boxContactListener import BoxContactListener
+from game.gameHandler import GameHandler
+from game.headlessMatch import HeadlessMatch
+from location import Location
+from pilotAction import PilotAction
+from spaceshipPilot import SpaceshipPilot
+
+ACCELERATIONS = np.array([[1, 0], [0, 2], [4, 4], [-1, 0], [0, 0], [3, -1]], dtype=float)
+
+
+class ScriptedPilot(SpaceshipPilot):
+
+	def __init__(self):
+		super().__init__()
+		self.states = []
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		self.states.append((current_location, current_energy))
+		action = PilotAction()
+		if game_tick < len(ACCELERATIONS):
+			action.move_spaceship_with_vec(ACCELERATIONS[game_tick])
+		if game_tick == 2:
+			action.shoot_rocket(0)
+		return action
+
+
+class ForwardModelTest(unittest.TestCase):
+
+	def test_rules_match_game_handler(self):
+		world = b2World()
+		handler = GameHandler(world, BoxContactListener(world), 100, 5)
+		self.assertEqual(handler.maxSpaceshipSpeedPerTick, forwardModel.MAX_SPEED_PER_TICK)
+		self.assertEqual(handler.rocketSpeed / handler.ticksPerSecond, forwardModel.ROCKET_SPEED_PER_TICK)
+		self.assertEqual(handler.moveCostFactor, forwardModel.MOVE_COST_FACTOR)
+		self.assertEqual(handler.shootCost, forwardModel.SHOOT_COST)
+		self.assertEqual(handler.energyPerTick, forwardModel.ENERGY_PER_TICK)
+		self.assertEqual(handler.spaceshipMaxEnergy, forwardModel.MAX_ENERGY)
+
+	def test_rollout_matches_match(self):
+		# a big field keeps the spaceships away from each other and the border
+		match = HeadlessMatch([ScriptedPilot, ScriptedPilot], game_size=1000, seed=3, max_ticks=len(ACCELERATIONS) + 1)
+		match.run()
+		pilot = match.spaceships[0].pilot
+		location, energy = pilot.states[0]
+
+		predicted = forwardModel.rollout(location, energy, ACCELERATIONS[np.newaxis], np.array([[np.nan, np.nan, 0, np.nan, np.nan, np.nan]]))
+		for tick, (actual_location, actual_energy) in enumerate(pilot.states):
+			np.testing.assert_allclose(predicted.positions[0, tick], actual_location.get_position(), atol=1e-3)
+			np.testing.assert_allclose(predicted.velocities[0, tick], actual_location.get_velocity(), atol=1e-3)
+			self.assertAlmostEqual(predicted.energies[0, tick], actual_energy, places=3)
+		self.assertEqual([False, False, True, False, False, False], predicted.isRocketShot[0].tolist())
+
+	def test_unaffordable_move_is_ignored(self):
+		velocities, energies = forwardModel.apply_moves(np.array([[1.0, 0.0], [1.0, 0.0]]), np.array([100.0, 10.0]), np.array([[0.0, 3.0], [0.0, 3.0]]))
+		np.testing.assert_allclose(velocities, [[1, 3], [1, 0]])
+		np.testing.assert_allclose(energies, [85, 10])
+
+	def test_speed_is_limited(self):
+		velocities, _ = forwardModel.apply_moves(np.array([4.0, 0.0]), np.array(100.0), np.array([4.0, 0.0]))
+		np.testing.assert_allclose(velocities, [forwardModel.MAX_SPEED_PER_TICK, 0])
+
+	def test_closest_approach(self):
+		distances, ticks = forwardModel.calc_closest_approaches(
+			np.array([0.0, 0.0]), np.array([5.0, 0.0]), np.array([20.0, 3.0]), np.array([0.0, 0.0]))
+		self.assertAlmostEqual(3, distances)
+		self.assertAlmostEqual(4, ticks)
+
+	def test_rocket_positions(self):
+		location = Location(np.array([10.0, 10.0]), np.zeros(2))
+		predicted = forwardModel.rollout(location, 100, np.zeros((1, 3, 2)), np.array([[math.pi / 2, np.nan, np.nan]]))
+		np.testing.assert_allclose(predicted.get_rocket_positions(3)[0, 0], [10, 25], atol=1e-9)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from game.pilotBuffer import MAX_LOCATED, PilotBuffer, shared_memory
+from location import Location
+from pilotAction import PilotAction, ScanAction
+
+
+@unittest.skipIf(shared_memory is None, "shared memory is not supported by this Python version")
+class PilotBufferTest(unittest.TestCase):
+
+	def setUp(self):
+		self.buffer = PilotBuffer()
+		# attached like in a pilot process
+		self.pilotBuffer = PilotBuffer(self.buffer.name)
+
+	def tearDown(self):
+		self.pilotBuffer.close()
+		self.buffer.close(True)
+
+	def test_observation_round_trip(self):
+		location = Location(np.array([1.5, 2.0]), np.array([-0.25, 3.0]))
+		located = [Location(np.array([4.0, 5.0]), np.array([0.0, 1.0]))]
+		self.assertTrue(self.buffer.write_observation(3, 12, location, 90.0, 45.5, located))
+		game_tick, read_location, health, energy, read_located = self.pilotBuffer.read_observation(3, "update")
+		self.assertEqual((12, 90.0, 45.5), (game_tick, health, energy))
+		np.testing.assert_array_equal(location.get_velocity(), read_location.get_velocity())
+		np.testing.assert_array_equal(located[0].get_position(), read_located[0].get_position())
+
+		# pilots can keep their locations after the next observation was written
+		self.assertTrue(self.buffer.write_observation(4, 13, located[0], 80.0, 40.0))
+		np.testing.assert_array_equal([1.5, 2.0], read_location.get_position())
+		self.assertEqual(4, len(self.pilotBuffer.read_observation(4, "prepare_scan")))
+		with self.assertRaises(ValueError):
+			self.pilotBuffer.read_observation(3, "prepare_scan")
+
+	def test_too_many_located_spaceships_are_not_written(self):
+		location = Location(np.zeros(2), np.zeros(2))
+		self.assertFalse(self.buffer.write_observation(1, 0, location, 100.0, 100.0, [location] * (MAX_LOCATED + 1)))
+
+	def test_action_round_trip(self):
+		action = PilotAction()
+		action.move_spaceship_with_vec([0.5, -1.0])
+		action.shoot_rocket(1.25)
+		self.assertTrue(self.pilotBuffer.write_action(5, action))
+		read_action = self.buffer.read_action(5, "update")
+		np.testing.assert_array_equal([0.5, -1.0], read_action.acceleration)
+		self.assertEqual(1.25, read_action.shootAngle)
+
+		self.assertTrue(self.pilotBuffer.write_action(6, ScanAction(0.5, 30, 1.0)))
+		scan = self.buffer.read_action(6, "prepare_scan")
+		self.assertEqual((0.5, 30, 1.0), (scan.direction, scan.distance, scan.angle))
+
+		self.assertTrue(self.pilotBuffer.write_action(7, None))
+		self.assertIsNone(self.buffer.read_action(7, "update"))
+		# anything else is pickled instead
+		self.assertFalse(self.pilotBuffer.write_action(8, "left"))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from bots.creeper import Creeper
+from bots.orbiter import Orbiter
+from game import pilotProtocol
+from game.headlessMatch import HeadlessMatch
+from game.hostedPilot import PilotHost
+from game.pilotSandbox import PilotCrashError
+from location import Location
+from pilotAction import PilotAction, ScanAction
+
+# creates its pilots but never answers their calls
+HANGING_HOST = """
+import sys, time
+from game import pilotProtocol
+while True:
+	kind, _, records = pilotProtocol.decode_request(pilotProtocol.read_frame(sys.stdin.buffer))
+	if kind != pilotProtocol.CREATE:
+		time.sleep(60)
+	pilotProtocol.write_frame(sys.stdout.buffer, pilotProtocol.encode_reply(kind, [(slot, "#FFFFFF", False) for slot, _ in records]))
+"""
+
+# moves with an acceleration that does not fit into a reply
+MALFORMED_PILOT = """
+from pilotAction import PilotAction
+from spaceshipPilot import SpaceshipPilot
+
+class Malformed(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		action = PilotAction()
+		action.acceleration = [1, 2, 3]
+		return action
+"""
+
+
+class PilotHostTest(unittest.TestCase):
+
+	def test_protocol_round_trip(self):
+		location = Location(np.array([1.5, 2.0]), np.array([-0.25, 3.0]))
+		located = [Location(np.array([4.0, 5.0]), np.array([0.0, 1.0]))]
+		body = pilotProtocol.encode_request(pilotProtocol.UPDATE, 7, [0, 3], [(location, 90.0, 45.5, located), (location, 10.0, 0.0, [])])
+		kind, game_tick, records = pilotProtocol.decode_request(body)
+		self.assertEqual((pilotProtocol.UPDATE, 7), (kind, game_tick))
+		self.assertEqual([0, 3], [slot for slot, _ in records])
+		decoded_location, health, energy, decoded_located = records[0][1]
+		np.testing.assert_array_equal(location.get_velocity(), decoded_location.get_velocity())
+		self.assertEqual((90.0, 45.5), (health, energy))
+		np.testing.assert_array_equal(located[0].get_position(), decoded_located[0].get_position())
+		self.assertEqual([], records[1][1][3])
+
+		action = PilotAction()
+		action.move_spaceship_with_vec(np.array([0.5, -1.0]))
+		action.shoot_rocket(1.25)
+		kind, results = pilotProtocol.decode_reply(pilotProtocol.encode_reply(pilotProtocol.UPDATE, [(0, action, False), (3, None, True)]))
+		np.testing.assert_array_equal([0.5, -1.0], results[0][1].acceleration)
+		self.assertEqual(1.25, results[0][1].shootAngle)
+		self.assertEqual((3, None, True), results[1])
+
+		kind, results = pilotProtocol.decode_reply(pilotProtocol.encode_reply(pilotProtocol.PREPARE_SCAN, [(1, ScanAction(0.5, 30, 1.0), False), (2, None, False)]))
+		self.assertEqual((0.5, 30, 1.0), (results[0][1].direction, results[0][1].distance, results[0][1].angle))
+		self.assertIsNone(results[1][1])
+
+	def test_same_result_as_in_game_process(self):
+		result = HeadlessMatch([Orbiter, Creeper], seed=1, max_ticks=20, record_digests=True).run()
+		hosts = [
+			PilotHost([sys.executable, "-m", "game.pilotHost", "bots/orbiter.py"], "Orbiter"),
+			PilotHost([sys.executable, "-m", "game.pilotHost", "bots/creeper.py"], "Creeper")]
+		try:
+			hosted_result = HeadlessMatch([host.create_pilot_class() for host in hosts], seed=1, max_ticks=20, record_digests=True).run()
+		finally:
+			for host in hosts:
+				host.close()
+		self.assertEqual(result.digests, hosted_result.digests)
+		self.assertEqual(["Orbiter", "Creeper"], [ship.name for ship in hosted_result.ships])
+
+	def test_hanging_host_is_stopped(self):
+		host = PilotHost([sys.executable, "-c", HANGING_HOST], "Sleepy", timeout=0.2)
+		try:
+			start = time.perf_counter()
+			result = HeadlessMatch([host.create_pilot_class(), Orbiter], seed=1, max_ticks=5).run()
+			self.assertLess(time.perf_counter() - start, 5)
+			self.assertEqual(5, result.ticks)
+			self.assertEqual(1, result.ships[0].crashes)
+			self.assertIsNotNone(host.process.returncode)
+		finally:
+			host.close()
+
+	def test_malformed_action_fails_only_its_call(self):
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "malformed.py")
+			with open(path, "w") as file:
+				file.write(MALFORMED_PILOT)
+			host = PilotHost([sys.executable, "-m", "game.pilotHost", path], "Malformed")
+			try:
+				result = HeadlessMatch([host.create_pilot_class(), Orbiter], seed=1, max_ticks=5).run()
+				self.assertEqual(5, result.ships[0].crashes)
+				self.assertIsNone(host.process.poll())
+			finally:
+				host.close()
+
+	def test_ended_host_can_not_create_pilots(self):
+		host = PilotHost([sys.executable, "-c", "import sys; sys.exit(3)"], "Nobody")
+		try:
+			with self.assertRaisesRegex(PilotCrashError, "exit code 3"):
+				host.create_pilot_class()()
+		finally:
+			host.close()
+
+
+if __name__ == '__main__':
+	unittest.main()
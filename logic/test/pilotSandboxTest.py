@@ -0,0 +1,192 @@
+import math
+import time
+import unittest
+
+from bots.creeper import Creeper
+from bots.orbiter import Orbiter
+from game.headlessMatch import HeadlessMatch
+from game.pilotSandbox import PilotSandbox, resource
+from pilotAction import PilotAction, ScanAction
+from render.settings import fwSettings
+from spaceshipPilot import SpaceshipPilot
+
+
+class SleepingPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		if game_tick == 1:
+			time.sleep(1)
+		action = PilotAction()
+		action.move_spaceship_with_vec([1, 0])
+		return action
+
+
+class OnceLatePilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return ScanAction(0, 20, 1)
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		if game_tick == 1:
+			time.sleep(0.08)
+		action = PilotAction()
+		action.move_spaceship_with_vec([1, 0])
+		return action
+
+
+class ThinkingPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		time.sleep(0.05)
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		time.sleep(0.05)
+		return None
+
+
+class RoundScanPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return ScanAction(0, 10, 2 * math.pi)
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		return None
+
+
+class CrashingPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		raise RuntimeError("crash")
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		return None
+
+
+class GreedyPilot(SpaceshipPilot):
+
+	def prepare_scan(self, game_tick, current_location, current_health, current_energy):
+		return None
+
+	def update(self, game_tick, current_location, current_health, current_energy, located_spaceships):
+		self.memory = bytearray(2 * 1024 * 1024 * 1024)
+		return None
+
+
+class PilotSandboxTest(unittest.TestCase):
+
+	def play(self, pilot_classes, sandbox, max_ticks=10, seed=1):
+		try:
+			return HeadlessMatch(pilot_classes, seed=seed, max_ticks=max_ticks, record_digests=True, pilot_sandbox=sandbox).run()
+		finally:
+			if sandbox:
+				sandbox.close()
+
+	def test_same_result_as_without_sandbox(self):
+		result = self.play([Orbiter, Creeper], None, 20)
+		for use_buffers in (True, False):
+			sandboxed_result = self.play([Orbiter, Creeper], PilotSandbox(deadline=5, use_buffers=use_buffers), 20)
+			self.assertEqual(result.digests, sandboxed_result.digests)
+			self.assertEqual(["Orbiter", "Creeper"], [ship.name for ship in sandboxed_result.ships])
+
+	def test_slow_pilot_times_out(self):
+		start = time.perf_counter()
+		result = self.play([SleepingPilot, Creeper], PilotSandbox(deadline=0.05))
+		self.assertLess(time.perf_counter() - start, 10)
+		# the late call and the calls skipped while it was still running
+		self.assertGreaterEqual(result.ships[0].timeouts, 1)
+		self.assertEqual(0, result.ships[1].timeouts)
+		self.assertEqual(10, result.ticks)
+
+	def test_pilot_missing_one_deadline_keeps_playing(self):
+		result = self.play([OnceLatePilot, Creeper], PilotSandbox(deadline=0.05))
+		self.assertEqual(10, result.ticks)
+		# the late update, the next call is only sent after the late answer arrived
+		self.assertIn(result.ships[0].timeouts, (1, 2))
+		self.assertEqual(0, result.ships[0].crashes)
+
+	def test_pilots_think_in_parallel(self):
+		sandbox = PilotSandbox(deadline=5)
+		try:
+			match = HeadlessMatch([ThinkingPilot] * 4, seed=1, max_ticks=5, pilot_sandbox=sandbox)
+			start = time.perf_counter()
+			result = match.run()
+			duration = time.perf_counter() - start
+		finally:
+			sandbox.close()
+		# one after another, the pilots would take 4 * 2 * 0.05 s per tick
+		self.assertLess(duration, 5 * 0.4 * 0.75)
+		self.assertEqual(5, result.ticks)
+
+	def test_pipelined_pilots_think_between_ticks(self):
+		settings = fwSettings(pipelinePilots=True)
+		sandbox = PilotSandbox(deadline=5)
+		try:
+			match = HeadlessMatch([ThinkingPilot] * 4, seed=1, max_ticks=5, settings=settings, pilot_sandbox=sandbox)
+			longest_step = 0
+			while not match.is_over():
+				start = time.perf_counter()
+				match.step()
+				longest_step = max(longest_step, time.perf_counter() - start)
+				# paces the steps like the window does
+				time.sleep(1 / match.hz)
+		finally:
+			sandbox.close()
+		self.assertLess(longest_step, 0.05)
+
+	def test_pipelined_scans_leave_out_destroyed_spaceships(self):
+		match = HeadlessMatch([], seed=1, max_ticks=5, settings=fwSettings(pipelinePilots=True))
+		ships = [match.place_spaceship(RoundScanPilot(), (50 + 3 * i, 50), 0, (0, 0), 100, 100) for i in range(3)]
+		game_handler = match.gameHandler
+		game_handler.update()
+		tick = game_handler.pendingTick
+		match.contactHandler.destroy_spaceship(ships[0])
+		game_handler.resolve_scans(tick)
+
+		self.assertEqual([], tick.scanResults[ships[0]])
+		self.assertEqual(100, ships[0].energy)
+		for ship in ships[1:]:
+			self.assertEqual(1, len(tick.scanResults[ship]))
+		self.assertEqual(2, len(match.contactHandler.scans))
+
+	def test_pipelined_pilot_missing_one_deadline_keeps_playing(self):
+		sandbox = PilotSandbox(deadline=0.05)
+		try:
+			match = HeadlessMatch([OnceLatePilot, Creeper], seed=1, max_ticks=10, settings=fwSettings(pipelinePilots=True), pilot_sandbox=sandbox)
+			while not match.is_over():
+				match.step()
+				# paces the steps like the window does, so that late answers arrive between game ticks
+				time.sleep(0.2 / match.hz)
+			result = match.get_result()
+		finally:
+			sandbox.close()
+		self.assertEqual(10, result.ticks)
+		self.assertIn(result.ships[0].timeouts, (1, 2))
+		self.assertEqual(0, result.ships[0].crashes)
+
+	def test_pipelined_result_does_not_depend_on_sandbox(self):
+		settings = fwSettings(pipelinePilots=True)
+		result = HeadlessMatch([Orbiter, Creeper], seed=1, max_ticks=20, record_digests=True, settings=settings).run()
+		sandbox = PilotSandbox(deadline=5)
+		try:
+			sandboxed_result = HeadlessMatch([Orbiter, Creeper], seed=1, max_ticks=20, record_digests=True, settings=settings, pilot_sandbox=sandbox).run()
+		finally:
+			sandbox.close()
+		self.assertEqual(result.digests, sandboxed_result.digests)
+
+	def test_crashes_are_counted(self):
+		result = self.play([CrashingPilot, Creeper], PilotSandbox(deadline=5))
+		self.assertEqual(10, result.ships[0].crashes)
+		self.assertEqual(0, result.ships[1].crashes)
+
+	@unittest.skipIf(resource is None, "memory limits are not supported on this platform")
+	def test_memory_is_limited(self):
+		result = self.play([GreedyPilot, Creeper], PilotSandbox(deadline=5, memory_limit=512 * 1024 * 1024), 3)
+		self.assertEqual(3, result.ships[0].crashes)
+
+
+if __name__ == '__main__':
+	unittest.main()
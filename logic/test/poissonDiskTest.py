@@ -0,0 +1,32 @@
+import random
+import unittest
+
+import numpy as np
+
+from logic.poissonDisk import sample_poisson_disk
+
+
+class PoissonDiskTest(unittest.TestCase):
+
+	def test_points_keep_distance(self):
+		points = np.array(sample_poisson_disk(5, 195, 8, 300, random.Random(1)))
+		self.assertEqual(300, len(points))
+		self.assertTrue(np.all((points >= 5) & (points <= 195)))
+
+		distances = np.linalg.norm(points[:, np.newaxis] - points[np.newaxis, :], axis=2)
+		np.fill_diagonal(distances, np.inf)
+		self.assertGreaterEqual(distances.min(), 8)
+
+	def test_full_square_returns_fewer_points(self):
+		points = sample_poisson_disk(0, 20, 8, 100, random.Random(1))
+		self.assertLess(len(points), 100)
+		self.assertGreater(len(points), 0)
+
+	def test_same_seed_same_points(self):
+		self.assertEqual(
+			sample_poisson_disk(0, 100, 5, 50, random.Random(7)),
+			sample_poisson_disk(0, 100, 5, 50, random.Random(7)))
+
+
+if __name__ == '__main__':
+	unittest.main()
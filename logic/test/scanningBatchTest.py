@@ -0,0 +1,61 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from location import Location
+from logic import scanning
+
+
+class ScanningBatchTest(unittest.TestCase):
+
+	def assert_same_as_single_scans(self, positions: np.ndarray, scans):
+		locations = [Location(pos) for pos in positions]
+		batch_results = scanning.calc_located_spaceships_batch(
+			positions,
+			[scan[0] for scan in scans],
+			[scan[1] for scan in scans],
+			[scan[2] for scan in scans],
+			[scan[3] for scan in scans])
+
+		for (scanner, direction, distance, angle), located in zip(scans, batch_results):
+			expected = [i for i, loc in enumerate(locations) if i != scanner and scanning.is_loc_in_scan(loc, locations[scanner], direction, distance, angle)]
+			self.assertEqual(expected, located)
+
+	def test_no_scans(self):
+		self.assertEqual([], scanning.calc_located_spaceships_batch(np.zeros((3, 2)), [], [], [], []))
+
+	def test_scanner_does_not_locate_itself(self):
+		positions = np.array([[0, 0], [0, 0], [1, 0]], dtype=float)
+		self.assertEqual([[1, 2]], scanning.calc_located_spaceships_batch(positions, [0], [0], [2], [2 * math.pi]))
+
+	def test_ship_on_circle_edge(self):
+		positions = np.array([[0, 0], [2, 0], [2.01, 0]], dtype=float)
+		self.assertEqual([[1]], scanning.calc_located_spaceships_batch(positions, [0], [0], [2], [2 * math.pi]))
+
+	def test_ship_on_segment_edge_within_epsilon(self):
+		positions = np.array([[0, 0], [1, 1], [0, 1]], dtype=float)
+		self.assertEqual([[1]], scanning.calc_located_spaceships_batch(positions, [0], [0], [2], [math.pi / 2]))
+
+	def test_segment_across_negative_pi(self):
+		positions = np.array([[0, 0], [-1, 1], [-1, -1], [1, 0]], dtype=float)
+		self.assertEqual([[1, 2]], scanning.calc_located_spaceships_batch(positions, [0], [-math.pi], [2], [math.pi / 2]))
+
+	def test_random_scans_match_single_scans(self):
+		rnd = random.Random(0)
+		for _ in range(50):
+			positions = np.array([[rnd.uniform(0, 100), rnd.uniform(0, 100)] for _ in range(rnd.randint(1, 20))])
+			scans = [(
+				rnd.randrange(len(positions)),
+				rnd.uniform(-2 * math.pi, 2 * math.pi),
+				rnd.uniform(0, 50),
+				rnd.uniform(0, 2 * math.pi)) for _ in range(rnd.randint(1, 10))]
+			self.assert_same_as_single_scans(positions, scans)
+
+	def test_boundary_scans_match_single_scans(self):
+		rnd = random.Random(1)
+		for _ in range(200):
+			positions = np.array([[50, 50]] + [[rnd.randint(40, 60), rnd.randint(40, 60)] for _ in range(10)], dtype=float)
+			scans = [(0, rnd.choice([0, math.pi / 4, math.pi / 2, math.pi, -math.pi]), rnd.randint(1, 10), rnd.choice([math.pi / 4, math.pi / 2, math.pi, 2 * math.pi]))]
+			self.assert_same_as_single_scans(positions, scans)
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game.scenario import Scenario
+
+
+class ScenarioTest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def write_scenario(self, content: str) -> str:
+		path = os.path.join(self.directory.name, "scenario.json")
+		with open(path, "w") as file:
+			file.write(content)
+		return path
+
+	def test_bundled_scenario(self):
+		scenario = Scenario.load("scenarios/rocketStorm.json")
+		self.assertEqual((200, 2, 200), (scenario.gameSize, scenario.seed, scenario.maxTicks))
+		self.assertEqual(20, len(scenario.ships))
+		self.assertEqual("bots/creeper.py", scenario.ships[0].pilot)
+		self.assertEqual((30, 40), scenario.ships[0].position)
+
+		match = scenario.create_match(record_digests=True)
+		self.assertEqual(20, len(match.spaceships))
+		self.assertEqual(len(scenario.rockets), len(match.contactHandler.rockets))
+		self.assertAlmostEqual(30, match.spaceships[0].body.position.x, places=4)
+		self.assertEqual("Creeper", match.spaceships[0].name)
+
+		# scenarios are seeded, so they always play out the same way
+		self.assertEqual(match.run().digests, scenario.create_match(record_digests=True).run().digests)
+
+	def test_optional_fields(self):
+		scenario = Scenario.load(self.write_scenario(json.dumps({
+			"ships": [
+				{"pilot": "bots/orbiter.py", "position": [20, 20], "velocity": [1, 0], "health": 40},
+				{"pilot": "bots/orbiter.py", "position": [80, 80]}]})))
+		self.assertEqual((100, None, None, []), (scenario.gameSize, scenario.seed, scenario.maxTicks, scenario.rockets))
+		match = scenario.create_match()
+		self.assertEqual([40, 100], [ship.health for ship in match.spaceships])
+		# velocities of scenarios are per game tick
+		self.assertAlmostEqual(match.ticksPerSecond, match.spaceships[0].body.linearVelocity.x, places=4)
+
+	def test_malformed_scenarios(self):
+		for content in (
+				"{\"ships\": [",
+				"{\"gameSize\": 100}",
+				"{\"ships\": [{\"position\": [10, 10]}]}",
+				"{\"ships\": [{\"pilot\": \"bots/orbiter.py\", \"position\": 10}]}",
+				"{\"ships\": [], \"rockets\": [{\"shooter\": 0}]}"):
+			with self.assertRaises(ValueError, msg=content):
+				Scenario.load(self.write_scenario(content))
+
+	def test_rocket_of_missing_shooter(self):
+		scenario = Scenario.load(self.write_scenario(json.dumps({
+			"ships": [{"pilot": "bots/orbiter.py", "position": [20, 20]}],
+			"rockets": [{"shooter": 1, "position": [50, 50], "heading": 0}]})))
+		with self.assertRaises(ValueError):
+			scenario.create_match()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from bots.batman import Batman
+from bots.creeper import Creeper
+from bots.explorer import Explorer
+from bots.orbiter import Orbiter
+from game.headlessMatch import HeadlessMatch
+
+
+class SeedTest(unittest.TestCase):
+
+	def test_same_seed_same_match(self):
+		for seed in range(3):
+			first = HeadlessMatch([Orbiter, Creeper, Explorer, Batman], seed=seed, record_digests=True).run()
+			second = HeadlessMatch([Orbiter, Creeper, Explorer, Batman], seed=seed, record_digests=True).run()
+			self.assertEqual(first.digests, second.digests)
+			self.assertEqual(first.winner, second.winner)
+			self.assertEqual(first.ticks, len(first.digests))
+			# plain floats, so that results can be printed and compared without numpy
+			self.assertEqual({float}, {type(value) for ship in first.ships for value in (ship.health, ship.energy)})
+
+	def test_pilots_get_seeded_random_generators(self):
+		first = Explorer.create_seeded(7)
+		second = Explorer.create_seeded(7)
+		# Explorer already uses its random generator in __init__
+		self.assertEqual(first.scanDir, second.scanDir)
+		self.assertEqual(first.random.random(), second.random.random())
+		self.assertNotEqual(Explorer.create_seeded(8).scanDir, first.scanDir)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,63 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from logic import scanning
+from logic.spatialGrid import SpatialGrid
+
+
+class SpatialGridTest(unittest.TestCase):
+
+	def test_query_box_contains_all_points_in_box(self):
+		rnd = np.random.default_rng(0)
+		positions = rnd.uniform(-5, 105, (500, 2))
+		grid = SpatialGrid(100, 7)
+		grid.rebuild(positions)
+
+		for _ in range(100):
+			lower = rnd.uniform(-10, 100, 2)
+			upper = lower + rnd.uniform(0, 40, 2)
+			candidates = set(grid.query_box(lower, upper).tolist())
+			inside = np.flatnonzero(np.all((positions >= lower) & (positions <= upper), axis=1))
+			self.assertTrue(set(inside.tolist()) <= candidates)
+
+	def test_query_boxes_returns_box_of_each_point(self):
+		grid = SpatialGrid(100, 10)
+		grid.rebuild(np.array([[5.0, 5.0], [95.0, 95.0], [15.0, 5.0]]))
+		boxes, points = grid.query_boxes(np.array([[0.0, 0.0], [90.0, 90.0]]), np.array([[9.0, 9.0], [99.0, 99.0]]))
+		self.assertEqual([0, 1], boxes.tolist())
+		self.assertEqual([0, 1], points.tolist())
+
+	def test_empty_box(self):
+		grid = SpatialGrid(100, 10)
+		grid.rebuild(np.array([[50.0, 50.0]]))
+		self.assertEqual(0, len(grid.query_box(np.array([60.0, 60.0]), np.array([40.0, 40.0]))))
+
+	def test_scan_bounds_contain_segment(self):
+		rnd = random.Random(2)
+		for _ in range(200):
+			direction = rnd.uniform(-math.pi, math.pi)
+			distance = rnd.uniform(1, 50)
+			angle = rnd.uniform(0, 2 * math.pi)
+			lower, upper = scanning.calc_scan_bounds(np.zeros((1, 2)), np.array([direction]), np.array([distance]), np.array([angle]))
+
+			for a in np.linspace(direction - angle / 2, direction + angle / 2, 50):
+				point = np.array([math.cos(a), math.sin(a)]) * distance
+				self.assertTrue(np.all(point >= lower[0]) and np.all(point <= upper[0]))
+
+	def test_grid_scans_match_batch_scans(self):
+		rnd = random.Random(3)
+		for size in (100, 400):
+			positions = np.array([[rnd.uniform(0, size), rnd.uniform(0, size)] for _ in range(300)])
+			grid = SpatialGrid(size, 10)
+			grid.rebuild(positions)
+			scans = (
+				list(range(0, 300, 3)),
+				[rnd.uniform(-math.pi, math.pi) for _ in range(100)],
+				[rnd.uniform(0, 50) for _ in range(100)],
+				[rnd.choice([rnd.uniform(0, 2 * math.pi), math.pi / 2, 2 * math.pi]) for _ in range(100)])
+			self.assertEqual(
+				scanning.calc_located_spaceships_batch(positions, *scans),
+				scanning.calc_located_spaceships_grid(grid, positions, *scans))
@@ -0,0 +1,31 @@
+import unittest
+
+from bots.orbiter import Orbiter
+from game.headlessMatch import HeadlessMatch
+
+
+class ColorlessPilot(Orbiter):
+
+	def __init__(self):
+		super().__init__()
+		# spawning its spaceship raises a TypeError
+		self.shipColor = None
+
+
+class SpawnTest(unittest.TestCase):
+
+	def test_pilots_that_can_not_be_spawned_are_left_out(self):
+		match = HeadlessMatch([Orbiter, ColorlessPilot, Orbiter], seed=1)
+		self.assertEqual(2, len(match.spaceships))
+
+	def test_spaced_pilots_that_can_not_be_spawned_are_left_out(self):
+		match = HeadlessMatch([Orbiter] * 9 + [ColorlessPilot], game_size=200, seed=1)
+		self.assertEqual(9, len(match.spaceships))
+
+	def test_too_many_spaceships_for_the_field(self):
+		with self.assertRaises(ValueError):
+			HeadlessMatch([Orbiter] * 50, game_size=30, seed=1)
+
+
+if __name__ == '__main__':
+	unittest.main()
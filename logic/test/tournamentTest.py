@@ -0,0 +1,23 @@
+import unittest
+
+from game.headlessMatch import MatchResult, ShipResult
+from game.tournament import create_lineups, find_winner
+
+
+class TournamentTest(unittest.TestCase):
+
+	def test_lineups(self):
+		lineups = create_lineups(["a.py", "b.py", "c.py"], rounds=2)
+		self.assertEqual(8, len(lineups))
+		self.assertEqual(("a.py", "b.py", "c.py"), lineups[-1])
+		self.assertEqual(3, len(create_lineups(["a.py", "b.py", "c.py"], free_for_all=False)))
+
+	def test_winner_among_pilots_with_the_same_name(self):
+		lineup = ("bots/orbiter.py", "other/orbiter.py")
+		ships = [ShipResult("Orbiter", 0, 50), ShipResult("Orbiter", 30, 50)]
+		self.assertEqual("other/orbiter.py", find_winner(lineup, MatchResult("Orbiter", 100, ships, 1)))
+		self.assertIsNone(find_winner(lineup, MatchResult(None, 100, ships, 1)))
+
+
+if __name__ == '__main__':
+	unittest.main()
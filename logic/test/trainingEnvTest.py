@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from bots.creeper import Creeper
+from bots.orbiter import Orbiter
+from game.trainingEnv import OBSERVATION_COLUMNS, TrainingEnv
+
+
+def idle_actions(env_count: int) -> np.ndarray:
+	actions = np.zeros((env_count, 3))
+	actions[:, 2] = np.nan
+	return actions
+
+
+class TrainingEnvTest(unittest.TestCase):
+
+	def test_reset_observes_all_spaceships(self):
+		env = TrainingEnv(2, [Orbiter, Creeper], seed=3)
+		observations = env.reset()
+		self.assertEqual((2, 3, len(OBSERVATION_COLUMNS)), observations.shape)
+		np.testing.assert_array_equal(np.full((2, 3), 100.0), observations[:, :, 4])
+		self.assertTrue(np.all((observations[:, :, 0:2] > 0) & (observations[:, :, 0:2] < env.gameSize)))
+		# arenas are played with different seeds
+		self.assertFalse(np.array_equal(observations[0], observations[1]))
+
+		again = TrainingEnv(2, [Orbiter, Creeper], seed=3).reset()
+		np.testing.assert_array_equal(observations, again)
+
+	def test_step_applies_actions(self):
+		env = TrainingEnv(2, [Orbiter], seed=1)
+		env.reset()
+		actions = idle_actions(2)
+		actions[0, 0:2] = (1, 0)
+		observations, rewards, dones = env.step(actions)
+
+		self.assertGreater(observations[0, 0, 2], 0)
+		np.testing.assert_array_equal([0, 0], observations[1, 0, 2:4])
+		np.testing.assert_array_equal([0, 0], rewards)
+		np.testing.assert_array_equal([False, False], dones)
+
+	def test_ended_matches_are_reset(self):
+		env = TrainingEnv(1, [Orbiter], max_ticks=3, seed=1)
+		env.reset()
+		match = env.matches[0]
+		for _ in range(2):
+			observations, rewards, dones = env.step(idle_actions(1))
+			self.assertFalse(dones[0])
+		self.assertIs(match, env.matches[0])
+
+		observations, rewards, dones = env.step(idle_actions(1))
+		self.assertTrue(dones[0])
+		# a tie is neither won nor lost
+		self.assertEqual(0, rewards[0])
+		self.assertIsNot(match, env.matches[0])
+		self.assertEqual(match.gameHandler.seed + 1, env.matches[0].gameHandler.seed)
+		np.testing.assert_array_equal([100, 100], observations[0, :, 4])
+
+	def test_rewards_count_lost_health(self):
+		env = TrainingEnv(1, [Orbiter], seed=1)
+		observations = env.reset()
+		agent = env.matches[0].spaceships[0]
+		opponent = env.matches[0].spaceships[1]
+		agent.damage(10)
+		opponent.damage(30)
+		observations, rewards, dones = env.step(idle_actions(1))
+		self.assertEqual(20, rewards[0])
+		np.testing.assert_array_equal([90, 70], observations[0, :, 4])
+
+
+if __name__ == '__main__':
+	unittest.main()
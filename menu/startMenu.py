@@ -16,8 +16,12 @@ from util import fileLoad
 
 class StartGameMenu(GameMenu):
 
-	def __init__(self, window: PygletWindow, game_start_callback):
+	def __init__(self, window: PygletWindow, game_start_callback, max_pilots: int = 8):
+		"""
+		:param max_pilots: number of pilots that can be selected for a match, the same pilot can be selected many times
+		"""
 		self.gameStartCallback = game_start_callback
+		self.maxPilots = max_pilots
 		self.pilotClasses = {}
 		self.max_label_width = 220  # manually evaluated
 		self._setup_watchdog()
@@ -98,7 +102,7 @@ class StartGameMenu(GameMenu):
 		return ""
 
 	def _select_pilot(self, button: CustomButton):
-		if len(self.selectedPilotsBox) >= 8:
+		if len(self.selectedPilotsBox) >= self.maxPilots:
 			return
 		text = button.get_foreground().get_text()
 		self.selectedPilotsBox.add_elem(CustomButton(text, self._deselect_pilot))
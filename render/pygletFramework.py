@@ -121,7 +121,7 @@ class PygletFramework:
 	def __reset(self):
 		self.world = None
 		self.mouseJoint = None
-		self.settings = fwSettings
+		self.settings = None
 		self.mouseWorld = None
 		self.stepCount = 0
 		self.renderer = None
@@ -147,8 +147,12 @@ class PygletFramework:
 
 		self.setup_keys()
 
-	def __init__(self, window: pyglet.window.Window):
+	def __init__(self, window: pyglet.window.Window, settings: fwSettings = None):
+		"""
+		:param settings: options of the simulation, the defaults of fwSettings if None
+		"""
 		self.__reset()
+		self.settings = settings if settings is not None else fwSettings()
 		self.world = b2World(gravity=(0, 0), doSleep=True)
 		self.destructionListener = fwDestructionListener(test=self)
 		self.world.destructionListener = self.destructionListener
@@ -23,6 +23,11 @@
 # Plainly added by Aaron
 
 class fwSettings(object):
+    """
+    Options of a simulation. The class attributes are the defaults,
+    instances can override them for one world, e.g. fwSettings(hz=30).
+    """
+
     # The default backend to use in (can be: pyglet, pygame, etc.)
     backend = 'pyglet'
 
@@ -34,40 +39,97 @@ class fwSettings(object):
     enableWarmStarting = True
     enableContinuous = True     # Calculate time of impact
     enableSubStepping = False
+    # Uses the FAST_PHYSICS preset for the physics options
+    fastPhysics = False
+
+    # Runs each pilot in its own process, pilots that take longer than pilotDeadline seconds do nothing in that tick.
+    # pilotDeadline is also the deadline of async pilots
+    sandboxPilots = False
+    pilotDeadline = 0.05
+    # Lets sandboxed pilots think during the physics steps until the next game tick instead of all in one frame,
+    # their actions are applied one game tick later. Implies sandboxPilots
+    pipelinePilots = False
+
+    # Width and height of the game field
+    gameSize = 100
+    # Number of pilots that can be selected for a match
+    maxPilots = 8
 
     # Miscellaneous testbed options
     pause = False
     singleStep = False
 
+    def __init__(self, **options):
+        for name, value in options.items():
+            if name.startswith('_') or not hasattr(fwSettings, name) or callable(getattr(fwSettings, name)):
+                raise ValueError("Unknown simulation setting \"" + name + "\".")
+            setattr(self, name, value)
+        if self.fastPhysics:
+            for name, value in FAST_PHYSICS.items():
+                setattr(self, name, value)
+
+
+# Physics options for bulk runs like tournaments: half the physics steps per game tick and fewer solver iterations.
+# Game ticks, rocket speed and damage stay the same, only collisions between spaceships are resolved less exactly,
+# so matches play out differently than with the default options.
+FAST_PHYSICS = {
+    'hz': 30.0,
+    'velocityIterations': 4,
+    'positionIterations': 2,
+}
+
 
-from optparse import OptionParser
+from optparse import OptionParser, BadOptionError, AmbiguousOptionError
 
-parser = OptionParser()
-list_options = [i for i in dir(fwSettings)
-                if not i.startswith('_')]
 
-for opt_name in list_options:
-    value = getattr(fwSettings, opt_name)
-    if isinstance(value, bool):
-        if value:
-            parser.add_option('', '--no-' + opt_name, dest=opt_name,
-                              default=value, action='store_' + str(not value).lower(),
-                              help="don't " + opt_name)
+class PassThroughOptionParser(OptionParser):
+    """
+    Leaves unknown options in the positional arguments instead of exiting,
+    so other entry points (e.g. spaceJam.py --tournament) can define their own flags.
+    """
+
+    def _process_args(self, largs, rargs, values):
+        while rargs:
+            try:
+                OptionParser._process_args(self, largs, rargs, values)
+            except (BadOptionError, AmbiguousOptionError) as e:
+                largs.append(e.opt_str)
+
+
+def create_parser():
+    parser = PassThroughOptionParser()
+    list_options = [i for i in dir(fwSettings)
+                    if not i.startswith('_') and not callable(getattr(fwSettings, i))]
+
+    for opt_name in list_options:
+        value = getattr(fwSettings, opt_name)
+        if isinstance(value, bool):
+            if value:
+                parser.add_option('', '--no-' + opt_name, dest=opt_name,
+                                  default=value, action='store_' + str(not value).lower(),
+                                  help="don't " + opt_name)
+            else:
+                parser.add_option('', '--' + opt_name, dest=opt_name, default=value,
+                                  action='store_' + str(not value).lower(),
+                                  help=opt_name)
+
         else:
+            if isinstance(value, int):
+                opttype = 'int'
+            elif isinstance(value, float):
+                opttype = 'float'
+            else:
+                opttype = 'string'
             parser.add_option('', '--' + opt_name, dest=opt_name, default=value,
-                              action='store_' + str(not value).lower(),
-                              help=opt_name)
-
-    else:
-        if isinstance(value, int):
-            opttype = 'int'
-        elif isinstance(value, float):
-            opttype = 'float'
-        else:
-            opttype = 'string'
-        parser.add_option('', '--' + opt_name, dest=opt_name, default=value,
-                          type=opttype,
-                          help='sets the %s option' % (opt_name,))
+                              type=opttype,
+                              help='sets the %s option' % (opt_name,))
+    return parser
 
 
-fwSettings, args = parser.parse_args()
+def parse_settings(argv):
+    """
+    Creates settings from command line options like --hz 30 or --fastPhysics.
+    :return: the settings and the arguments that are not settings
+    """
+    options, args = create_parser().parse_args(argv)
+    return fwSettings(**vars(options)), args
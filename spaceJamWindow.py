@@ -0,0 +1,207 @@
+import os
+from typing import List
+
+import pyglet
+from Box2D import b2Vec2
+from pyglet import gl
+from pyglet.window import key
+
+from game.boxBackground import BoxBackground
+from game.boxBorder import BoxBorder
+from game.boxContactListener import BoxContactListener
+from game.gameHandler import GameHandler
+from game.pilotSandbox import PilotSandbox
+from menu.gameOverMenu import GameOverGameMenu
+from menu.gameMenu import GameMenu
+from menu.pauseMenu import PauseGameMenu
+from menu.startMenu import StartGameMenu
+from render.pygletFramework import PygletFramework
+from render.settings import fwSettings
+from util import fileLoad
+
+
+class SpaceJam(PygletFramework):
+
+	def __init__(self, window_size: int, settings: fwSettings = None):
+		super(SpaceJam, self).__init__(pyglet.window.Window(config=pyglet.gl.Config(sample_buffers=1, samples=8), width=window_size, height=window_size), settings)
+		self.windowSize = window_size
+		self.window.set_caption("Space Jam")
+		icon_path = fileLoad.resource_path("res" + os.path.sep + "rocket.png")
+		self.window.set_icon(pyglet.image.load(icon_path))
+
+		# https://jotson.itch.io/gravity-pixel-font
+		fileLoad.load_font("GravityRobotBold8.ttf")
+		fileLoad.load_font("GravityRegular5.ttf")
+
+		self.gameSize = self.settings.gameSize
+		self.spaceshipSize = 5  # spaceship svg model currently has size 5
+
+		self.background = BoxBackground(self.gameSize, self.settings.hz)
+		self.gui = None
+
+		self.arePhysicsOn = False
+		self.isGameOver = True
+		self.isGamePaused = False
+		self.doDisplayNames = True
+
+		self.frameCount = 0
+		self.gameTicksPerSecond = 5
+
+		self.contactHandler = BoxContactListener(self.world, self.settings.hz)
+		self.world.contactListener = self.contactHandler
+		self.gameHandler = GameHandler(self.world, self.contactHandler, self.gameSize, self.gameTicksPerSecond)
+		if self.settings.sandboxPilots or self.settings.pipelinePilots:
+			self.gameHandler.pilotSandbox = PilotSandbox(self.settings.pilotDeadline)
+		self.gameHandler.pipelinePilots = self.settings.pipelinePilots
+		self.gameHandler.asyncPilotDeadline = self.settings.pilotDeadline
+		self._create_game_field()
+
+		self.startMenu = StartGameMenu(self.window, lambda: self.start_simulation(self.startMenu.get_selected_pilot_classes()), self.settings.maxPilots)
+		self.gamOverMenu = GameOverGameMenu(self.window, self._return_to_start)
+		self.pauseMenu = PauseGameMenu(self.window, self.continue_game, self._return_to_start)
+
+		gl.glLoadMatrixf(self.get_game_projection())
+		gl.glEnable(gl.GL_BLEND)
+		gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+		self._return_to_start()
+
+	def get_game_projection(self):
+		border_thickness = 1
+		scale = self.windowSize / (self.gameSize + 4 * border_thickness)
+
+		gl.glPushMatrix()
+		gl.glLoadIdentity()
+		gl.glMatrixMode(gl.GL_MODELVIEW)
+		gl.glScalef(scale, scale, 1)
+		gl.glTranslatef(2 * border_thickness, 2 * border_thickness, 0)
+
+		matrix = (gl.GLfloat * 16)()
+		gl.glGetFloatv(pyglet.gl.GL_MODELVIEW_MATRIX, matrix)
+		gl.glPopMatrix()
+		return matrix
+
+	def _show_gui(self, gui: GameMenu):
+		self._hide_gui()
+		self.gui = gui
+		self.gui.unhide()
+
+	def _hide_gui(self):
+		if self.gui:
+			self.gui.hide()
+			self.gui = None
+
+	def _return_to_start(self):
+		self.arePhysicsOn = False
+		self.isGameOver = True
+		self.isGamePaused = False
+		self.contactHandler.reset()
+		self.gameHandler.close_async_loop()
+		if self.gameHandler.pilotSandbox:
+			self.gameHandler.pilotSandbox.close()
+		self._show_gui(self.startMenu)
+
+	def start_simulation(self, pilot_classes: List):
+		self._hide_gui()
+		self.gameHandler.reset()
+		bodies, contacts = self.contactHandler.start_match()
+		print("Match start: " + str(bodies) + " bodies, " + str(contacts) + " contacts")
+
+		try:
+			self.gameHandler.spawn_pilots(pilot_classes)
+		except ValueError as e:
+			print(e)
+			self._return_to_start()
+			return
+
+		self.stepCount = 0
+		self.arePhysicsOn = True
+		self.isGameOver = False
+
+	def pause_game(self):
+		self.isGamePaused = True
+		self._show_gui(self.pauseMenu)
+
+	def continue_game(self):
+		if not self.isGamePaused:
+			return
+		self.isGamePaused = False
+		self._hide_gui()
+
+	def _announce_result(self):
+		self.isGameOver = True
+		bodies, contacts = self.contactHandler.get_world_counts()
+		print("Match end: " + str(bodies) + " bodies, " + str(contacts) + " contacts")
+		self.gamOverMenu.set_time(self.gameHandler.gameTick)
+		self._show_gui(self.gamOverMenu)
+
+		if len(self.contactHandler.spaceships) > 0:
+			self.gamOverMenu.set_winner(next(iter(self.contactHandler.spaceships)).name)
+		else:
+			self.gamOverMenu.set_tie()
+
+	def display(self, dt):
+		if self.arePhysicsOn:
+			self.SimulationLoop(1 / self.settings.hz)
+
+		# don't draw shapes and texts on same layer :P
+		self.window.clear()
+		self.renderer.clear_batch()
+		self.background.display(self.renderer, 0, self.frameCount)
+
+		effect_step = self.contactHandler.stepCount
+		for explosion in self.contactHandler.explosions:
+			explosion.display(self.renderer, 1, effect_step)
+		for scan in self.contactHandler.scans:
+			scan.display(self.renderer, 1, effect_step)
+		for rocket in self.contactHandler.rockets:
+			rocket.display(self.renderer, 1)
+		self.border.display(self.renderer, 2)
+
+		text_layer = 4
+		for ship in self.contactHandler.spaceships:
+			ship.display(self.renderer, 3, text_layer if self.doDisplayNames else None)
+			text_layer += 1
+
+		self.renderer.StartDraw()
+
+		if self.gui:
+			self.gui.display()
+		self.frameCount += 1
+
+	def Step(self):
+		if self.isGamePaused:
+			return
+		super().Step()
+		self.contactHandler.after_world_step()
+
+		if not self.isGameOver:
+			if len(self.contactHandler.spaceships) < 2:
+				self._announce_result()
+			elif self.stepCount % (self.settings.hz // self.gameTicksPerSecond) == 0:
+				self.gameHandler.update()
+			else:
+				self.gameHandler.advance_pending_tick()
+		# keeps effects fading out after the game is over
+		self.contactHandler.end_step()
+
+	def _create_game_field(self):
+		self.world.gravity = (0.0, 0.0)
+		self.border = BoxBorder(self.world, self.gameSize, 1)
+		# sets scale of renderer. this has no effect on rendering, only on mouse coordinate calculation
+		self.renderer.setZoom((self.gameSize + 4 * self.border.thickness) / 2)
+		self.renderer.setCenter(b2Vec2(self.gameSize / 2, self.gameSize / 2))
+
+	def Keyboard(self, pressed):
+		if pressed == key.BACKSPACE:
+			self._return_to_start()
+		elif pressed == key.SPACE:
+			if self.isGameOver:
+				self._return_to_start()
+			elif self.arePhysicsOn:
+				if self.isGamePaused:
+					self.continue_game()
+				else:
+					self.pause_game()
+		elif pressed == key.F1:
+			self.doDisplayNames = not self.doDisplayNames
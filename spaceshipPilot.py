@@ -1,4 +1,5 @@
 import math
+import random
 from math import cos, sin, pi
 
 from typing import List
@@ -14,11 +15,25 @@ class SpaceshipPilot:
 	def __init__(self, ship_color: str = "#FFFFFF"):
 		"""
 		Abstract class for piloting a spaceship.
+		Use self.random instead of the random module, so that matches can be replayed with the same seed.
 		:param game_width: width and height of the game field
 		:param spaceship_size: maximum size of the spaceship
 		:param ship_color: hex string for the ship color
 		"""
 		self.shipColor = ship_color
+		# already seeded if the pilot was created with create_seeded
+		if not hasattr(self, "random"):
+			self.random = random.Random()
+
+	@classmethod
+	def create_seeded(cls, seed: int) -> "SpaceshipPilot":
+		"""
+		Creates a pilot whose random generator is seeded before __init__ runs, so that __init__ can already use it.
+		"""
+		pilot = cls.__new__(cls)
+		pilot.random = random.Random(seed)
+		pilot.__init__()
+		return pilot
 
 	def prepare_scan(
 			self,
@@ -51,6 +66,45 @@ class SpaceshipPilot:
 		raise NotImplementedError()
 
 
+class AsyncSpaceshipPilot(SpaceshipPilot):
+
+	def __init__(self, ship_color: str = "#FFFFFF"):
+		"""
+		Abstract class for piloting a spaceship with coroutines, e.g. for pilots that wait for a server.
+		The game runs prepare_scan and update of all async pilots at once on one event loop,
+		so that their waiting overlaps, and waits at most until the pilot deadline of the game tick.
+		Pilots that are late are cancelled and their last scan or action is used again.
+		"""
+		super().__init__(ship_color)
+		# last scan and action returned in time, set by the game
+		self.lastScan = None
+		self.lastAction = None
+		# number of calls that were cancelled at the deadline
+		self.timeoutCount = 0
+
+	async def prepare_scan(
+			self,
+			game_tick: int,
+			current_location: Location,
+			current_health: float,
+			current_energy: float) -> ScanAction:
+		"""
+		See SpaceshipPilot.prepare_scan
+		"""
+		raise NotImplementedError()
+
+	async def update(
+			self, game_tick: int,
+			current_location: Location,
+			current_health: float,
+			current_energy: float,
+			located_spaceships: List[Location]) -> PilotAction:
+		"""
+		See SpaceshipPilot.update
+		"""
+		raise NotImplementedError()
+
+
 def calc_scan_energy_cost(distance: float, angle: float) -> float:
 	"""
 	Calculates the energy cost of a scan relative to the size of scanned area
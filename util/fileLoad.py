@@ -1,8 +1,7 @@
 import importlib.util
 import os
 import sys
-
-import pyglet
+import types
 
 
 def resource_path(relative_path):
@@ -14,6 +13,8 @@ def resource_path(relative_path):
 
 
 def load_font(file_name: str):
+	# imported here so that pilots can be loaded in processes without a window
+	import pyglet
 	font_path = resource_path("res" + os.path.sep + file_name)
 	pyglet.font.add_file(font_path)
 
@@ -24,16 +25,21 @@ def load_external_module(rel_path: str):
 	if not os.path.isfile(abs_path):
 		raise ValueError("Could not find module \"" + abs_path + "\".")
 
-	module_name = abs_path.split(os.path.sep)[-1].split(".")[0]
+	module_name = "pilots." + abs_path.split(os.path.sep)[-1].split(".")[0]
 	spec = importlib.util.spec_from_file_location(module_name, abs_path)
 	module = importlib.util.module_from_spec(spec)
+	# registers the module under its own package, so that pilots can be pickled for match checkpoints
+	# without replacing modules of the game that have the same name
+	if "pilots" not in sys.modules:
+		sys.modules["pilots"] = types.ModuleType("pilots")
+	sys.modules[module_name] = module
 	spec.loader.exec_module(module)
 	return module
 
 
 def load_class_by_module_name(module_path):
 	module = load_external_module(module_path)
-	class_name = module.__name__.split("/")[-1]
+	class_name = module.__name__.split(".")[-1]
 	class_name = class_name[0].upper() + class_name[1:]
 	try:
 		return getattr(module, class_name)